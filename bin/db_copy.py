@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import logging
 import asyncio
-from datetime import datetime
+from time import monotonic
 
 from vzclient.asyncio import DatabaseCopy
 
@@ -17,8 +17,13 @@ DEFAULT_CONFIG = {
         "copy_tags": ["uuid", "unit", "type", "title"],
         "add_tags": {},
         "chunk_size": 8192,
+        "queue_size": 2,
         "transform": None,
         "buffer_size": 1000000,
+        "flush_interval": None,
+        "max_inflight": 2,
+        "concurrency": 8,
+        "scale": None,
 
         #
         "source": {
@@ -49,19 +54,19 @@ DEFAULT_CONFIG = {
 
 async def main():
     logging.basicConfig(level=logging.DEBUG)
+    start = monotonic()
     dbcopy = DatabaseCopy.from_yaml("config.yaml", DEFAULT_CONFIG)
     list_channels = False
 
     if list_channels:
         channels = await dbcopy.get_channels()
+        await dbcopy.close()
         for channel in channels:
             print(DatabaseCopy.get_name(channel), channel.get('type', "n.a"))
     else:
         await dbcopy.copy()
 
-    start = datetime.utcnow()
-
-    runtime = (datetime.utcnow() - start).total_seconds()
+    runtime = monotonic() - start
     logging.info("Total execution time: {}s".format(runtime))
 
 
@@ -41,6 +41,30 @@ class BufferTestCase(unittest.TestCase):
         self.assertEqual(buf.capacity, len(buf))
         self.assertRaises(BufferError, buf.write, b"Overflow")
 
+        buf.clear()
+        buf.write(b"Hello")
+        self.assertRaises(BufferError, buf.write, b" World", b"!", b"Overflow!")
+        self.assertEqual(b"Hello", buf.data())
+
+    def test_append(self):
+        buf = Buffer(12)
+        self.assertEqual(5, buf.append(b"Hello"))
+        self.assertEqual(7, buf.append(b" World!"))
+        self.assertEqual(b"Hello World!", buf.data())
+        self.assertRaises(BufferError, buf.append, b"!")
+        self.assertEqual(12, len(buf))
+
+    def test_detach(self):
+        buf = Buffer(12)
+        buf.write(b"Hello")
+        data = buf.detach()
+        self.assertEqual(b"Hello", data)
+        self.assertFalse(buf)
+        buf.write(b"World")
+        self.assertEqual(b"Hello", data)
+        self.assertEqual(b"World", buf.detach(data.obj))
+        self.assertRaises(ValueError, buf.detach, bytearray(3))
+
     def test_clear(self):
         buf = Buffer(20)
         buf.write(b"Hello ", b"World", b"!")
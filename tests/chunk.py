@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from vzclient import Chunk
+from vzclient.chunk import WITH_NUMPY
+import unittest
+
+
+class ChunkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        if not WITH_NUMPY:
+            self.skipTest("numpy not available")
+
+    def test_from_points(self):
+        points = [(1, 1.1), (2, 1.2), (5, 1.2)]
+        chunk = Chunk.from_points(points)
+        self.assertEqual(3, len(chunk))
+        self.assertTrue(chunk)
+        self.assertEqual(points, list(chunk))
+        self.assertEqual(points[1:], list(chunk[1:]))
+        self.assertEqual((5, 1.2), chunk[-1])
+        self.assertEqual(chunk, points)
+        self.assertFalse(Chunk.from_points([]))
+
+    def test_init(self):
+        chunk = Chunk.from_points([(1, 1.1), (2, 1.2)])
+        self.assertRaises(ValueError, Chunk, chunk.t, chunk.x[:1])
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(ChunkTestCase)
+
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run( suite() )
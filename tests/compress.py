@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from vzclient import compress_const
+from vzclient import compress_const, Compressor
+from vzclient.chunk import Chunk
+from vzclient.compress import WITH_NUMPY
 import unittest
 
+if WITH_NUMPY:
+    import numpy as np
+
 class CompressTestCase(unittest.TestCase):
 
     def test_compress_const(self):
@@ -41,6 +46,26 @@ class CompressTestCase(unittest.TestCase):
         result = list(compress_const(series, max_gap=3))
         self.assertEqual(expected, result)
 
+    def test_compress_arrays(self):
+        if not WITH_NUMPY:
+            self.skipTest("numpy not available")
+        series = [(1, 1.), (2, 1.), (2, 2.), (3, 1.), (4, 1.), (5, 1.),
+                  (6, 2.), (7, 2.), (8, 2.), (9, 3.)]
+        for max_gap in (None, 2):
+            expected = list(compress_const(series, max_gap=max_gap))
+            for n in (1, 3, 4, len(series)):
+                compressor = Compressor(max_gap=max_gap)
+                empty = Chunk(np.array([], dtype=np.int64), np.array([]))
+                x, y = compressor.compress_arrays(empty.t, empty.x)
+                self.assertEqual(0, len(x))
+                result = []
+                for i in range(0, len(series), n):
+                    x, y = zip(*series[i:i + n])
+                    x, y = compressor.compress_arrays(np.array(x), np.array(y))
+                    result.extend(zip(x.tolist(), y.tolist()))
+                result.extend(compressor.finalize())
+                self.assertEqual(expected, result)
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(CompressTestCase)
@@ -2,7 +2,8 @@
 # -*- coding: utf-8 -*-
 
 from pathlib import Path
-from vzclient import read_vzlogger_config
+from tempfile import TemporaryDirectory
+from vzclient import read_vzlogger_config, read_yaml_config
 from vzclient.config_parser import remove_json_comments
 import unittest
 
@@ -19,6 +20,23 @@ class ConfigParserTestCase(unittest.TestCase):
             for i, line in enumerate(remove_json_comments(text).split("\n")):
                 print("{}: {}".format(i + 1, line))
 
+    def test_remove_json_comments_in_strings(self):
+        text = ('{"a": "http://x", // comment\n'
+                '  // line comment\n'
+                '\n'
+                ' "b": "q\\"/*", /* block\n comment */ "c": 1}')
+        self.assertEqual('{"a": "http://x", \n "b": "q\\"/*",  "c": 1}',
+                         remove_json_comments(text))
+
+    def test_read_yaml_config(self):
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "config.yaml"
+            path.write_text("# comment only\n")
+            self.assertEqual(dict(), read_yaml_config(path))
+            path.write_text("defaults:\n  source:\n    driver: mysql\n")
+            self.assertEqual({"defaults": {"source": {"driver": "mysql"}}},
+                             read_yaml_config(path))
+
     def test_parse_vzlogger_config(self):
         cfg_path = SHARE / "vzlogger.conf"
         cfg = read_vzlogger_config(cfg_path)
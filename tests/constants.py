@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+from vzclient.constants import time, timestamp, now
+from vzclient.constants import CHANNEL_TYPES, CHANNEL_TYPES_BY_NAME
+import unittest
+
+
+class ConstantsTestCase(unittest.TestCase):
+
+    def test_timestamp(self):
+        t = datetime(2021, 3, 4, 5, 6, 7, 891499)
+        self.assertEqual(1614834367891, timestamp(t))
+        self.assertEqual(1614834367892, timestamp(t.replace(microsecond=891500)))
+        self.assertEqual(-1, timestamp(datetime(1969, 12, 31, 23, 59, 59, 999000)))
+        self.assertEqual(1614834367891, timestamp(1614834367891))
+        self.assertRaises(TypeError, timestamp, "2021")
+
+    def test_channel_types_by_name(self):
+        self.assertEqual(len(CHANNEL_TYPES), len(CHANNEL_TYPES_BY_NAME))
+        self.assertEqual("kWh", CHANNEL_TYPES_BY_NAME["power"]["unit"])
+
+    def test_time(self):
+        t = 1614834367891
+        self.assertEqual(t, timestamp(time(t)))
+        self.assertLessEqual(abs(now() - timestamp(datetime.utcnow())), 1000)
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(ConstantsTestCase)
+
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run( suite() )
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from vzclient.asyncio import DatabaseCopy
+
+
+class DatabaseCopyTestCase(unittest.TestCase):
+
+    def test_make_re(self):
+        self.assertIsNone(DatabaseCopy.make_re("temp").match("temperature"))
+        self.assertTrue(DatabaseCopy.make_re("temp*").match("temperature"))
+        self.assertTrue(DatabaseCopy.make_re("te?p").match("temp"))
+        self.assertIsNone(DatabaseCopy.make_re("te?p").match("teemp"))
+        self.assertTrue(DatabaseCopy.make_re("a.b").match("a.b"))
+        self.assertIsNone(DatabaseCopy.make_re("a.b").match("axb"))
+
+    def test_include_exclude(self):
+        copy = DatabaseCopy(source={"driver": "mysql"},
+                            destination={"driver": "influx"},
+                            includes=["Temp*", {"channel": "Power?",
+                                                "max_gap": 5}],
+                            excludes={"types": ["virtual*"], "ids": ["7"]})
+        self.assertEqual((True, None), self.include(copy, "Temp1"))
+        self.assertEqual((True, 5), self.include(copy, "Power1"))
+        self.assertEqual((False, None), self.include(copy, "Power10"))
+        self.assertEqual((False, None), self.include(copy, "Foo"))
+
+        self.assertFalse(copy.exclude({"title": "Temp1", "id": 3}))
+        self.assertTrue(copy.exclude({"title": "Temp1", "id": 7}))
+        self.assertTrue(copy.exclude({"title": "T", "type": "virtual x"}))
+
+        match = copy.build_matcher()
+        for channel in ({"title": "Temp1", "id": 3},
+                        {"title": "Temp1", "id": 7},
+                        {"title": "Power1", "type": "virtual x"},
+                        {"title": "Power1"},
+                        {"title": "Foo"}):
+            expected = (not copy.exclude(channel)
+                        and copy.include(channel)[0])
+            keep, opts = match(channel)
+            self.assertEqual(expected, keep)
+            self.assertEqual(copy.include(channel)[1] if keep else {}, opts)
+
+    def test_get_io_helper(self):
+        source = {"driver": "mysql", "host": "localhost", "user": "vz"}
+        copy = DatabaseCopy(source=source, destination={"driver": "influx"})
+        driver, args, kwargs = copy.get_io_helper(None, "source", source)
+        self.assertEqual({"driver": "mysql", "host": "localhost", "user": "vz"},
+                         source)
+        self.assertIs(driver, copy.get_io_helper(None, "source", source)[0])
+
+    def test_get_influx_writer(self):
+        copy = DatabaseCopy(source={"driver": "mysql"},
+                            destination={"driver": "influx"})
+        channel = {"title": " Temp1 ", "type": "temperature", "uuid": "abc",
+                   "id": 3}
+        _, args, _ = copy.get_influx_writer(channel,
+                                            {"host": "localhost"},
+                                            copy_tags=["name", "unit", "uuid",
+                                                       "id"],
+                                            add_tags={"site": "home"})
+        self.assertEqual({"title": "Temp1", "unit": "°C", "uuid": "abc",
+                          "id": 3, "site": "home"},
+                         args["tags"])
+        _, args, _ = copy.get_influx_writer(channel, {"host": "localhost"})
+        self.assertIsNone(args["tags"])
+
+    def test_get_mysql_writer(self):
+        copy = DatabaseCopy(source={"driver": "mysql"},
+                            destination={"driver": "mysql"})
+        opts = {"host": "localhost", "user": "vz"}
+        driver, args, _ = copy.get_mysql_writer({"id": 3}, opts)
+        self.assertEqual({"channel_id": 3, "batch_size": 1000}, args)
+        _, args, _ = copy.get_mysql_writer({"id": 3}, opts, channel_id=5)
+        self.assertEqual(5, args["channel_id"])
+        self.assertIs(driver, copy.get_mysql_writer({"id": 4}, opts)[0])
+        self.assertIsNot(driver.get_writer(**args), driver.get_writer(**args))
+
+    @staticmethod
+    def include(copy, title):
+        ok, opts = copy.include({"title": title})
+        return ok, opts.get("max_gap")
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(DatabaseCopyTestCase)
+
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run( suite() )
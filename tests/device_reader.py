@@ -2,20 +2,19 @@
 # -*- coding: utf-8 -*-
 
 import asyncio
-from datetime import datetime
 import unittest
 import logging
 from io import StringIO
 
 from vzclient.asyncio import DeviceReader
 from vzclient.asyncio.device_reader import logger
-from vzclient.constants import time
+from vzclient.constants import time, now
 
 DEFAULT_VALUES = [float(x) for x in range(10)]
 
 async def stub_reader(sleep=0.1, values=iter(DEFAULT_VALUES)):
     await asyncio.sleep(sleep)
-    t = datetime.utcnow()
+    t = now()
     return t, next(values)
 
 
@@ -111,6 +110,24 @@ class DeviceReaderTestCase(unittest.TestCase):
         self.assertEqual(9,  # interpolation requires one additional read
                          output.count("Reading from device 'test_interpolate'"))
 
+    def test_get_value(self):
+        points = iter([(1000, 2.), (1500, 4.)])
+
+        async def read():
+            return next(points)
+
+        reader = DeviceReader(read, name="test_get_value")
+        self.loop.run_until_complete(reader.update())
+        self.assertEqual((1000, 2.), reader.get_value())
+        self.assertRaises(ValueError, reader.get_value, 1200)
+        self.loop.run_until_complete(reader.update())
+        self.assertEqual((1500, 4.), reader.get_value())
+        self.assertEqual((1250, 3.), reader.get_value(1250))
+        self.assertEqual((2000, 6.), reader.get_value(2000))
+        self.assertIn("Extrapolating 500 ms into the future",
+                      self.stream.getvalue())
+
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(DeviceReaderTestCase)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import unittest
+
+from vzclient.asyncio import InfluxDriver
+from vzclient.chunk import Chunk, WITH_NUMPY
+
+
+class InfluxDriverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(None)
+        self.sent = []
+        self.active = 0
+        self.max_active = 0
+
+    def tearDown(self):
+        self.loop.close()
+
+    async def insert(self, data, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if b"fail" in data:
+            raise RuntimeError("Request failed")
+        self.sent.append(data)
+
+    def test_get_prefix(self):
+        self.assertEqual(b"m value=", InfluxDriver.get_prefix("m"))
+        self.assertEqual(b"m,a=1,b=2 x=",
+                         InfluxDriver.get_prefix("m", {"b": "2", "a": "1"}, "x"))
+        self.assertIs(InfluxDriver.get_prefix("m", {"a": "1", "b": "2"}, "x"),
+                      InfluxDriver.get_prefix("m", {"b": "2", "a": "1"}, "x"))
+
+    def test_encode_lines(self):
+        prefix = InfluxDriver.get_prefix("m", tags={"id": "a"})
+        self.assertEqual(b"m,id=a value=1.5 10\nm,id=a value=2.0 20\n",
+                         InfluxDriver.encode_lines(prefix,
+                                                   [(10, 1.5), (20, 2.)]))
+        self.assertEqual(b"m,id=a value=0.25 10\n",
+                         InfluxDriver.encode_lines(prefix, [(10, 25)], 100))
+
+    def test_get_line_template(self):
+        prefix = InfluxDriver.get_prefix("m%", field_name="x")
+        self.assertEqual(b"m% x=1.5 10\n",
+                         InfluxDriver.get_line_template(prefix) % (1.5, 10))
+
+    def test_encode_chunk(self):
+        if not WITH_NUMPY:
+            self.skipTest("Requires numpy")
+        prefix = InfluxDriver.get_prefix("m%", field_name="x")
+        points = [(10, 1.5), (20, 0.1), (30, -3.)]
+        chunk = Chunk.from_points(points)
+        self.assertEqual(InfluxDriver.encode_lines(prefix, points),
+                         InfluxDriver.encode_lines(prefix, chunk))
+        self.assertEqual(b"", InfluxDriver.encode_lines(prefix, chunk[:0]))
+
+    def test_pipelined_flush(self):
+        async def run(writer):
+            for i in range(20):
+                await writer.write_chunk([(i, float(i))] * 5)
+            await writer.flush_buffer()
+            await writer.drain()
+
+        writer = InfluxDriver("localhost")
+        writer.init_writer("m", None, "value", 200, max_inflight=2)
+        writer.insert = self.insert
+        self.loop.run_until_complete(run(writer))
+        self.assertEqual(2, self.max_active)
+        self.assertEqual(100, sum(data.count(b"\n") for data in self.sent))
+
+    def test_failed_flush(self):
+        async def run(writer):
+            writer._prefix = b"fail value="
+            await writer.write_chunk([(1, 1.)])
+            await writer.flush_buffer()
+            await writer.drain()
+
+        writer = InfluxDriver("localhost")
+        writer.init_writer("m", None, "value", 200)
+        writer.insert = self.insert
+        self.assertRaises(RuntimeError, self.loop.run_until_complete,
+                          run(writer))
+
+    def test_shutdown_timeout(self):
+        class Connection(object):
+            async def close(self):
+                pass
+
+        async def hang(data, **kwargs):
+            await asyncio.sleep(10)
+
+        async def run(writer):
+            await writer.write_chunk([(1, 1.)])
+            await writer.__aexit__(None, None, None)
+
+        writer = InfluxDriver("localhost", shutdown_timeout=0.05)
+        writer.init_writer("m", None, "value", 200)
+        writer.insert = hang
+        writer._connection = Connection()
+        self.loop.run_until_complete(asyncio.wait_for(run(writer), 1))
+        self.assertFalse(writer.is_connected)
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(InfluxDriverTestCase)
+
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run( suite() )
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import unittest
+from unittest import mock
+
+from vzclient.asyncio import influx_hub
+from vzclient.asyncio.influx_hub import InfluxHub
+
+
+class InfluxHubTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def test_join_chunks(self):
+        hub = InfluxHub(buffer_size=10, max_request_size=5)
+        for chunk in (b"aa", b"bb", b"cc", b"dd"):
+            hub._buffer.write(chunk)
+            hub.flush_buffer()
+        self.assertEqual(8, hub._queued_bytes)
+        self.assertEqual(b"aabbcc", hub.join_chunks())
+        self.assertEqual(b"dd", hub.join_chunks())
+        self.assertEqual(0, hub._queued_bytes)
+        self.assertFalse(hub._output_queue)
+        self.assertEqual(3, len(hub._storage_pool))
+
+        hub._buffer.write(b"ee")
+        hub.flush_buffer()
+        self.assertEqual(2, len(hub._storage_pool))
+        self.assertEqual(b"ee", hub.join_chunks())
+
+    def test_stop(self):
+        async def reader():
+            t = 0
+            while True:
+                await asyncio.sleep(0.001)
+                t += 1
+                yield t, 1.5
+
+        async def run():
+            hub = InfluxHub(buffer_size=1000)
+            hub.connect_reader(reader(), measurement="m")
+            await asyncio.sleep(0.05)
+            await hub.stop(timeout=(1, 0.1))
+            return hub
+
+        hub = self.loop.run_until_complete(run())
+        self.assertTrue(all(task.done() and not task.cancelled()
+                            for task in hub._readers))
+        self.assertTrue(hub._flusher.cancelled())
+        self.assertFalse(hub._buffer)
+        self.assertTrue(hub._output_queue)
+
+    def test_stop_retries(self):
+        attempts = []
+
+        async def insert(client, data, **kwargs):
+            attempts.append(data)
+            raise RuntimeError("Server unavailable")
+
+        async def run():
+            hub = InfluxHub(buffer_size=1000, max_retries=4)
+            hub._buffer.write(b"m value=1 1\n")
+            hub.flush_buffer()
+            hub.connect_writer("localhost")
+            await asyncio.sleep(0.05)
+            await hub.stop(timeout=(0.1, 1))
+            return hub
+
+        with mock.patch.object(influx_hub.InfluxDriver, "insert", insert), \
+                mock.patch.object(influx_hub, "MAX_SHUTDOWN_RETRY_DELAY", 0.01), \
+                self.assertLogs("vzclient", level="ERROR"):
+            hub = self.loop.run_until_complete(run())
+        self.assertEqual(5, len(attempts))
+        self.assertTrue(all(task.done() for task in hub._writers))
+        self.assertFalse(hub._output_queue)
+        self.assertIsNone(hub._connector)
+
+    def test_precision(self):
+        async def reader():
+            yield 1499, 1.5
+            yield 1500, 2.5
+
+        with self.assertRaises(ValueError):
+            InfluxHub(precision="us")
+        hub = InfluxHub(buffer_size=1000, precision="s")
+        with self.assertLogs("vzclient", level="ERROR"):
+            self.loop.run_until_complete(hub.wrap_reader(reader(), "m"))
+        self.assertEqual(b"m value=1.5 1\nm value=2.5 2\n", hub.join_chunks())
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(InfluxHubTestCase)
+
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run( suite() )
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import unittest
+from unittest import mock
+
+from vzclient.asyncio import MySqlDriver, mysql_driver
+from vzclient.chunk import Chunk, WITH_NUMPY
+
+
+class Cursor:
+    closed = False
+
+    def __init__(self, connection=None):
+        self.connection = connection
+        self.batches = []
+
+    async def execute(self, query, args=None):
+        # like MySQL without autocommit, a statement opens a transaction
+        if self.connection is not None:
+            self.connection.in_transaction = True
+        return 0
+
+    async def fetchall(self):
+        return []
+
+    async def executemany(self, query, args):
+        self.batches.append((query, list(args)))
+        return len(args)
+
+    async def close(self):
+        self.closed = True
+
+
+class Pool:
+    """Pool releasing connections like aiomysql.Pool"""
+    def __init__(self):
+        self.closed = False
+        self.free = []
+
+    async def acquire(self):
+        return self.free.pop() if self.free else Connection()
+
+    def release(self, connection):
+        if connection.closed:
+            return
+        if connection.get_transaction_status():
+            connection.close()
+        else:
+            self.free.append(connection)
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+class Connection:
+    def __init__(self):
+        self.closed = False
+        self.commits = 0
+        self.in_transaction = False
+
+    def get_transaction_status(self):
+        return self.in_transaction
+
+    async def commit(self):
+        self.commits += 1
+        self.in_transaction = False
+
+    async def rollback(self):
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+    async def cursor(self):
+        return Cursor(self)
+
+
+class MySqlDriverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(None)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_acquire_retry(self):
+        pools = []
+
+        async def create_pool(**kwargs):
+            if not pools:
+                pools.append(None)
+                raise OSError("Connection refused")
+            pools.append(Pool())
+            return pools[-1]
+
+        async def run(driver):
+            async with driver.acquire() as client:
+                return client.is_connected
+
+        driver = MySqlDriver("localhost", "vz")
+        with mock.patch.object(mysql_driver.sql, "create_pool", create_pool):
+            with self.assertRaises(OSError):
+                self.loop.run_until_complete(run(driver))
+            self.assertIsNone(driver._pool)
+            self.assertTrue(self.loop.run_until_complete(run(driver)))
+            self.loop.run_until_complete(driver.close())
+        self.assertTrue(pools[-1].closed)
+        self.assertIsNone(driver._pool)
+
+    def test_acquire_reuse(self):
+        pool = Pool()
+
+        async def create_pool(**kwargs):
+            return pool
+
+        async def run(driver):
+            async with driver.acquire() as client:
+                await client.query("SELECT 1")
+                return client._connection
+
+        driver = MySqlDriver("localhost", "vz")
+        with mock.patch.object(mysql_driver.sql, "create_pool", create_pool):
+            connection = self.loop.run_until_complete(run(driver))
+            self.assertFalse(connection.closed)
+            self.assertFalse(connection.get_transaction_status())
+            self.assertEqual([connection], pool.free)
+            self.assertIs(connection, self.loop.run_until_complete(run(driver)))
+
+    def test_get_writer(self):
+        driver = MySqlDriver("localhost", "vz")
+        writer1 = driver.get_writer(1)
+        writer2 = driver.get_writer(2, batch_size=10)
+        self.assertIsNot(driver, writer1)
+        self.assertIsNot(writer1, writer2)
+        self.assertEqual(1, writer1._channel_id)
+        self.assertEqual(2, writer2._channel_id)
+        self.assertIsNone(driver._channel_id)
+
+    def test_write_chunk(self):
+        writer = MySqlDriver("localhost", "vz").get_writer(3, batch_size=2)
+        writer._connection = Connection()
+        writer._cursor = Cursor()
+        self.loop.run_until_complete(
+            writer.write_chunk([(10, 1.5), (20, 2.), (30, 2.5)]))
+        self.assertEqual([[(3, 10, 1.5), (3, 20, 2.)], [(3, 30, 2.5)]],
+                         [args for _, args in writer._cursor.batches])
+        self.assertTrue(writer._cursor.batches[0][0].startswith("INSERT"))
+        self.assertEqual(1, writer._connection.commits)
+
+        if WITH_NUMPY:
+            writer._cursor = Cursor()
+            chunk = Chunk.from_points([(40, 3.), (50, 3.5)])
+            self.loop.run_until_complete(writer.write_chunk(chunk))
+            self.assertEqual([[(3, 40, 3.), (3, 50, 3.5)]],
+                             [args for _, args in writer._cursor.batches])
+            self.assertEqual(2, writer._connection.commits)
+
+    def test_write_chunk_uninitialized(self):
+        driver = MySqlDriver("localhost", "vz")
+        with self.assertRaises(RuntimeError):
+            self.loop.run_until_complete(driver.write_chunk([(10, 1.)]))
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(MySqlDriverTestCase)
+
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run( suite() )
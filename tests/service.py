@@ -71,6 +71,19 @@ class ServiceTestCase(unittest.TestCase):
         service = loop.run_until_complete(main_wrapper())
         self.assertEqual(service.result, -2)
 
+    def test_wait_stop(self):
+        async def wait():
+            async with Service(signals=[signal.SIGALRM]) as service:
+                signal.alarm(1)
+                t0 = time.monotonic()
+                await service.wait_stop()
+                return service, time.monotonic() - t0
+
+        service, dt = asyncio.run(wait())
+        self.assertTrue(service.cancel)
+        self.assertEqual(signal.SIGALRM, service.signum)
+        self.assertLess(dt, 1.5)
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(ServiceTestCase)
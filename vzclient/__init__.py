@@ -1,8 +1,34 @@
-from .client import Client
-from .time_derivative import TimeDerivative
-from .power import Power
-from .compress import *
-from .config_parser import read_vzlogger_config
-from .buffer import Buffer
-from .service import Service
-from .tool_base import ToolBase
\ No newline at end of file
+from importlib import import_module
+
+# Public names and the submodules defining them. Submodules are imported on
+# first access, so that importing one of them does not pull in the third party
+# libraries of all others.
+_EXPORTS = {
+    "Client": "client",
+    "TimeDerivative": "time_derivative",
+    "Power": "power",
+    "Compressor": "compress",
+    "compress_const": "compress",
+    "read_vzlogger_config": "config_parser",
+    "read_yaml_config": "config_parser",
+    "Buffer": "buffer",
+    "Chunk": "chunk",
+    "Service": "service",
+    "ToolBase": "tool_base",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
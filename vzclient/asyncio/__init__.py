@@ -1,8 +1,31 @@
-from .autobahn import VzLoggerCodec
-from .mysql_driver import MySqlDriver
-from .influx_driver import InfluxDriver
-from .compress import compress_const
-from .database_copy import DatabaseCopy
-from .device_reader import DeviceReader
-from .influx_hub import InfluxHub
-from .logger import InfluxLogger
+from importlib import import_module
+
+# Public names and the submodules defining them. Submodules are imported on
+# first access, so that importing one of them does not pull in the third party
+# libraries of all others.
+_EXPORTS = {
+    "VzLoggerCodec": "autobahn",
+    "MySqlDriver": "mysql_driver",
+    "InfluxDriver": "influx_driver",
+    "compress_const": "compress",
+    "DatabaseCopy": "database_copy",
+    "DeviceReader": "device_reader",
+    "InfluxHub": "influx_hub",
+    "InfluxLogger": "logger",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,4 +1,8 @@
-from ..compress import Compressor
+from ..compress import Compressor, WITH_NUMPY
+from ..chunk import Chunk
+
+if WITH_NUMPY:
+    import numpy as np
 
 
 async def compress_const(aiterable, max_gap=None):
@@ -12,9 +16,22 @@ async def compress_const(aiterable, max_gap=None):
         max_gap (int): Maximum distance between neighbouring nodes.
 
     Yield:
-        list: Compressed items of iterable with constant nodes removed
+        Chunk or list: Compressed items of iterable with constant nodes
+        removed. Chunks are yielded as :class:`Chunk`, if the input consists of
+        chunks and numpy is available.
     """
     compressor = Compressor(max_gap=max_gap)
+    if WITH_NUMPY:
+        # Chunks stay in columnar form from input to output
+        is_chunk = False
+        async for chunk in aiterable:
+            is_chunk = isinstance(chunk, Chunk)
+            yield compress_chunk(compressor, chunk)
+        if compressor.is_initialized:
+            tail = list(compressor.finalize())
+            yield Chunk.from_points(tail) if is_chunk else tail
+        return
+
     ait = aiterable.__aiter__()
     try:
         chunk = await ait.__anext__()
@@ -23,4 +40,24 @@ async def compress_const(aiterable, max_gap=None):
         return
     async for chunk in ait:
         yield list(compressor.compress(chunk))
-    yield list(compressor.finalize())
\ No newline at end of file
+    yield list(compressor.finalize())
+
+
+def compress_chunk(compressor, chunk):
+    """Compress a chunk of (x, y) tuples using the vectorized compressor
+
+    Arguments:
+        compressor (Compressor): Compressor instance carrying the state between
+            chunks
+        chunk (list or Chunk): List of (x, y) tuples or a :class:`Chunk`
+
+    Return:
+        list or Chunk: Compressed chunk of the same type as `chunk`
+    """
+    if isinstance(chunk, Chunk):
+        return Chunk(*compressor.compress_arrays(chunk.t, chunk.x))
+    if not chunk:
+        return []
+    x, y = (np.asarray(a) for a in zip(*chunk))
+    x, y = compressor.compress_arrays(x, y)
+    return list(zip(x.tolist(), y.tolist()))
\ No newline at end of file
@@ -1,18 +1,36 @@
 import logging
 import asyncio
-from copy import deepcopy
 from datetime import datetime
-import yaml
+from time import monotonic
 import re
+import fnmatch
+import aiohttp
 
 from .influx_driver import InfluxDriver
 from .mysql_driver import MySqlDriver
 from .compress import compress_const
 from . import transform
+from .transform import chunk_trafo, quantize
+from ..config_parser import read_yaml_config
 
 
 logger = logging.getLogger("vzclient")
 
+def copy_dicts(d):
+    """Copy a nested dictionary
+
+    Only the dictionaries are copied, all other values are shared with `d`.
+
+    Arguments:
+        d (dict): Possibly nested dictionary
+
+    Return:
+        dict: Copy of `d`
+    """
+    return {k: copy_dicts(v) if isinstance(v, dict) else v
+            for k, v in d.items()}
+
+
 # TODO implement an incremental option, which queries the destination for the
 # latest timestamp available and copies only timestamps greater than this
 # value.
@@ -36,9 +54,22 @@ class DatabaseCopy:
             the input option of one channel to copy.
         excludes (dict): Dictionary containing various exclusion criteria.
             Excludes take precedence over includes.
+        concurrency (int): Maximum number of channels copied concurrently.
+            Each channel holds one source and one destination connection.
+            Defaults to 8.
     """
     TIME_FORMAT = "%Y-%m-%d %H:%M:%S:"
 
+    # Functions computing the value of tags copied from channel information.
+    # Other tags are copied verbatim.
+    TAG_GETTERS = {
+        "unit": lambda channel: DatabaseCopy.get_unit(channel),
+        "uuid": lambda channel: channel.get("uuid", "<none>"),
+        "title": lambda channel: DatabaseCopy.get_name(channel),
+        "name": lambda channel: DatabaseCopy.get_name(channel)
+    }
+    TAG_ALIASES = {"name": "title"}
+
     def __init__(self,
                  source,
                  destination,
@@ -48,10 +79,18 @@ class DatabaseCopy:
                  end=None,
                  max_gap=None,
                  chunk_size=8192,
+                 concurrency=8,
                  **kwargs):
         self._includes = list()
+        self._any_include = None
         self._excludes = dict()
+        self._match = None
         self._default_src = source
+        self.concurrency = int(concurrency)
+        if self.concurrency < 1:
+            raise ValueError(f"Invalid concurrency: {concurrency}")
+        self._connector = None
+        self._drivers = dict()
 
         self.init_includes(includes,
                            source=source,
@@ -65,30 +104,87 @@ class DatabaseCopy:
             self.init_excludes(**excludes)
 
     async def copy(self):
-        channels = await self.get_channels()
+        try:
+            channels = await self.get_channels()
+            await self.copy_channels(channels)
+        finally:
+            await self.close()
+
+    async def copy_channels(self, channels):
+        """Copy channels concurrently
+
+        Arguments:
+            channels (iterable): Channel information as returned by
+                :meth:`get_channels`
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(job):
+            async with semaphore:
+                return await job
+
         jobs = []
+        match = self._match
         for channel in channels:
-            if self.exclude(channel):
-                logger.debug("Channel {} explicitly excluded for copy process"
-                             .format(self.get_name(channel)))
-                continue
-            copy, opts = self.include(channel)
+            copy, opts = match(channel)
             if copy:
-                jobs.append(self.copy_channel(channel, **opts))
-                logger.debug("Will copy channel {}"
-                             .format(self.get_name(channel)))
-        logger.debug("Started {} copy jobs".format(len(jobs)))
-        await asyncio.gather(*jobs)
+                jobs.append(bounded(self.copy_channel(channel, **opts)))
+                logger.debug("Will copy channel %s", self.get_name(channel))
+            else:
+                logger.debug("Channel %s not selected for copy process",
+                             self.get_name(channel))
+        logger.debug("Started %d copy jobs", len(jobs))
+
+        # All writers share one pool of keep-alive connections
+        self._connector = aiohttp.TCPConnector(limit=self.concurrency,
+                                               keepalive_timeout=60,
+                                               enable_cleanup_closed=True)
+        try:
+            await asyncio.gather(*jobs)
+        finally:
+            await self._connector.close()
+            self._connector = None
+
+    async def close(self):
+        """Close all drivers cached by this instance"""
+        while self._drivers:
+            _, driver = self._drivers.popitem()
+            await driver.close()
+
+    def get_driver(self, cls, opts):
+        """Get a cached driver instance
+
+        Drivers are shared by all channels using the same options, so that
+        their connections can be pooled.
+
+        Arguments:
+            cls (type): Driver type
+            opts (dict): Keyword arguments passed to `cls`
+
+        Return:
+            Driver instance
+        """
+        key = (cls, repr(sorted(opts.items())))
+        try:
+            return self._drivers[key]
+        except KeyError:
+            driver = self._drivers[key] = cls(**opts)
+        return driver
 
     async def get_channels(self, source=None):
         """Get information about available channels from source
 
+        Arguments:
+            source (dict): Source driver configuration. The dictionary is not
+                modified. If ``None``, the source passed to init is used.
+                Defaults to ``None``.
+
         Return:
             list: List containing one dictionary with channel information per
                 channel.
         """
         if source is None:
-            source = deepcopy(self._default_src)
+            source = self._default_src
         src, sopt, opts = self.get_io_helper(None, "source", source)
         async with src.get_reader(**sopt) as reader:
             channels = await reader.get_channels()
@@ -103,20 +199,29 @@ class DatabaseCopy:
                            max_gap,
                            chunk_size,
                            transform=None,
+                           queue_size=2,
+                           scale=None,
                            **kwargs):
         name = self.get_name(channel)
-        logger.info(f"Copying channel '{name}' ...")
-        start = datetime.utcnow()
+        logger.info("Copying channel '%s' ...", name)
+        start = monotonic()
         src, sopt, opts = self.get_io_helper(channel,
                                              "source",
                                              source,
                                              **kwargs)
+        if scale is not None:
+            opts.update(scale=int(scale))
         dest, dopt, opts = self.get_io_helper(channel,
                                               "destination",
                                               destination,
                                               **opts)
+        if "scale" in opts:
+            raise ValueError(f"Destination of channel {name} does not support "
+                             f"fixed point values")
         for k in opts.keys():
-            logger.warning(f"Ignoring unsupported option {k} for channel {name}")
+            logger.warning("Ignoring unsupported option %s for channel %s",
+                           k,
+                           name)
 
         async with src.get_reader(**sopt) as reader, dest.get_writer(**dopt) as writer:
             gen = reader.iter_chunks(channel,
@@ -127,21 +232,62 @@ class DatabaseCopy:
                 trafo, trafo_args = self.get_transform(channel, **transform)
                 if trafo is not None:
                     gen = trafo(gen, **trafo_args)
+            if scale is not None:
+                # integer values compare exactly and need half the memory
+                gen = chunk_trafo(gen, trafo=quantize, scale=int(scale))
             if max_gap is not None:
                 gen = compress_const(gen, 1000 * max_gap) #max_gap[s] -> ms
 
+            # bounded queue throttles the reader, if the writer falls behind
+            queue = asyncio.Queue(maxsize=max(1, int(queue_size)))
+            producer = asyncio.ensure_future(self.produce(gen, queue))
             nmeas = 0
-            async for chunk in gen:
-                if chunk:
-                    n = len(chunk)
-                    logger.debug(f"Copying {n} measurements for channel {name}")
-                    await writer.write_chunk(chunk)
-                    nmeas += n
-
-        elapsed_time = (datetime.utcnow() - start).total_seconds()
-        logger.info(f"Copied {nmeas} measurements for channel '{name}' in {elapsed_time}s")
+            debug = logger.isEnabledFor(logging.DEBUG)
+            try:
+                while True:
+                    chunk = await queue.get()
+                    if chunk is None:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    if chunk:
+                        n = len(chunk)
+                        if debug:
+                            logger.debug("Copying %d measurements for channel "
+                                         "%s", n, name)
+                        await writer.write_chunk(chunk)
+                        nmeas += n
+            finally:
+                producer.cancel()
+                # wait for the producer, so the reader is idle before it closes
+                await asyncio.gather(producer, return_exceptions=True)
+
+        elapsed_time = monotonic() - start
+        logger.info("Copied %d measurements for channel '%s' in %.3fs",
+                    nmeas,
+                    name,
+                    elapsed_time)
         return nmeas
 
+    @staticmethod
+    async def produce(aiterable, queue):
+        """Move chunks from an asynchronous iterable to a queue
+
+        Puts ``None`` into the queue after the last chunk. If the iterable
+        raises, the exception is put into the queue instead.
+
+        Arguments:
+            aiterable (async iterable): Asynchronous iterable yielding chunks
+            queue (asyncio.Queue): Destination queue
+        """
+        try:
+            async for chunk in aiterable:
+                await queue.put(chunk)
+        except Exception as ex:
+            await queue.put(ex)
+        else:
+            await queue.put(None)
+
     def exclude(self, channel):
         """Check if a channel shall be excluded
 
@@ -151,10 +297,9 @@ class DatabaseCopy:
         Return:
             bool: True if and only if channel shall be excluded from copy
         """
-        for attr in ("title", "type", "class", "id"):
-            for pattern in self._excludes.get(attr, []):
-                if pattern.match(channel.get(attr, "").strip()):
-                    return True
+        for attr, pattern in self._excludes.items():
+            if pattern.match(str(channel.get(attr, "")).strip()):
+                return True
         return False
 
     def include(self, channel):
@@ -167,11 +312,45 @@ class DatabaseCopy:
             bool: True if and only if channel shall be excluded from copy
         """
         name = self.get_name(channel)
+        if self._any_include is None or not self._any_include.match(name):
+            return False, dict()
         for pattern, info in self._includes:
             if pattern.match(name):
                 return True, info
         return False, dict()
 
+    def build_matcher(self):
+        """Build a function selecting channels to copy
+
+        Combines :meth:`exclude` and :meth:`include` into a single closure,
+        which binds the compiled patterns of this instance as local variables.
+
+        Return:
+            callable: Function mapping a channel dictionary to a tuple
+            containing a flag, which is True if and only if the channel shall
+            be copied, and the copy options of the channel.
+        """
+        excludes = tuple((attr, p.match) for attr, p in self._excludes.items())
+        includes = tuple((p.match, opts) for p, opts in self._includes)
+        any_include = (self._any_include.match
+                       if self._any_include is not None else None)
+        get_name = self.get_name
+
+        def match(channel):
+            get = channel.get
+            for attr, exclude in excludes:
+                if exclude(str(get(attr, "")).strip()):
+                    return False, dict()
+            if any_include is None:
+                return False, dict()
+            name = get_name(channel)
+            if any_include(name):
+                for include, opts in includes:
+                    if include(name):
+                        return True, opts
+            return False, dict()
+        return match
+
     def get_io_helper(self, channel, type, opts, **kwargs):
         if type == "source":
             t = "reader"
@@ -179,6 +358,7 @@ class DatabaseCopy:
             t = "writer"
         else:
             ValueError("Invalid IO type: '{type}'")
+        opts = dict(opts)
         driver = opts.pop("driver")
         try:
             f = getattr(self, f"get_{driver}_{t}")
@@ -187,10 +367,22 @@ class DatabaseCopy:
         return f(channel, opts, **kwargs)
 
     def get_mysql_reader(self, channel, opts, **kwargs):
-        driver = MySqlDriver(**opts)
+        driver = self.get_driver(MySqlDriver, opts)
         reader_args = {}
         return driver, reader_args, kwargs
 
+    def get_mysql_writer(self,
+                         channel,
+                         opts,
+                         channel_id=None,
+                         batch_size=1000,
+                         **kwargs):
+        driver = self.get_driver(MySqlDriver, opts)
+        if channel_id is None:
+            channel_id = channel["id"]
+        writer_args = dict(channel_id=channel_id, batch_size=batch_size)
+        return driver, writer_args, kwargs
+
     def get_influx_writer(self,
                           channel,
                           opts,
@@ -199,29 +391,25 @@ class DatabaseCopy:
                           add_tags=None,
                           field_name="value",
                           buffer_size=500000,
+                          flush_interval=None,
+                          scale=None,
+                          max_inflight=2,
                           **kwargs):
-        driver = InfluxDriver(**opts)
-        tags = dict()
-        if copy_tags is None:
-            copy_tags = {}
-
-        for key in copy_tags:
-            if key == "unit":
-                value = self.get_unit(channel)
-            elif key == "uuid":
-                value = channel.get('uuid', "<none>")
-            elif key in ("title", "name"):
-                key = "title"
-                value = self.get_name(channel)
-            else:
-                value = channel[key]
-            tags[key] = value
+        driver = InfluxDriver(connector=self._connector, **opts)
+        getters = self.TAG_GETTERS
+        aliases = self.TAG_ALIASES
+        tags = {aliases.get(key, key):
+                getters[key](channel) if key in getters else channel[key]
+                for key in (copy_tags or ())}
         if add_tags is not None:
             tags.update(**add_tags)
         writer_args = dict(measurement=measurement,
                            tags=tags if tags else None,
                            field_name=field_name,
-                           buffer_size=buffer_size)
+                           buffer_size=buffer_size,
+                           flush_interval=flush_interval,
+                           scale=scale,
+                           max_inflight=max_inflight)
         return driver, writer_args, kwargs
 
     def init_excludes(self, titles=None, types=None, classes=None, ids=None):
@@ -233,8 +421,9 @@ class DatabaseCopy:
                 continue
             if isinstance(val, str):
                 val = [val]
-            excludes[key] = [self.make_re(s) for s in val]
+            excludes[key] = self.combine_re(self.make_re(s) for s in val)
         self._excludes.update(excludes)
+        self._match = self.build_matcher()
 
     def init_includes(self,
                       includes=None,
@@ -265,28 +454,29 @@ class DatabaseCopy:
 
         incs = []
         for inc in includes:
-            print("Creating ", inc)
-            src = deepcopy(source) if source is not None else dict()
-            dest = deepcopy(destination) if destination is not None else dict()
-            opts = dict(source=src, destination=dest, **deepcopy(kwargs))
+            src = dict(source) if source is not None else dict()
+            dest = dict(destination) if destination is not None else dict()
+            opts = dict(source=src, destination=dest, **copy_dicts(kwargs))
             if isinstance(inc, str):
                 pattern = self.make_re(inc)
             else:
+                inc = dict(inc)
                 pattern = self.make_re(inc.pop("channel"))
                 opts['source'].update(inc.pop("source", dict()))
                 opts['destination'].update(inc.pop("destination", dict()))
                 opts.update(inc)
             incs.append((pattern, opts))
         self._includes = incs
+        self._any_include = self.combine_re(p for p, _ in incs) if incs else None
+        self._match = self.build_matcher()
 
     @classmethod
     def from_yaml(cls, path, default_config=None):
         if default_config is not None:
-            cfg = deepcopy(default_config)
+            cfg = copy_dicts(default_config)
         else:
             cfg = dict()
-        with open(path) as cfg_file:
-            yaml_cfg = yaml.load(cfg_file, Loader=yaml.SafeLoader)
+        yaml_cfg = read_yaml_config(path)
 
         defaults = cfg.pop('defaults', dict())
         yaml_defaults = yaml_cfg.pop('defaults', dict())
@@ -320,18 +510,31 @@ class DatabaseCopy:
         if isinstance(includes, str):
             includes = [includes]
         for key in yaml_cfg.keys():
-            logger.warning(f"Ignored unknown section {key} in {path}")
+            logger.warning("Ignored unknown section %s in %s", key, path)
         return cls(source=src,
                    destination=dest,
                    includes=includes,
                    excludes=excludes,
                    **defaults)
 
+    @staticmethod
+    def combine_re(patterns):
+        """Combine regular expressions to a single alternation
+
+        Arguments:
+            patterns (iterable): Iterable of compiled regular expressions
+
+        Return:
+            re.Pattern: Regular expression matching if any of `patterns` does
+        """
+        return re.compile("|".join(f"(?:{p.pattern})" for p in patterns))
+
     @staticmethod
     def make_re(pattern):
         """Create a regular expression from a pattern string
 
-        Replaces wildcards with regular expression patterns
+        Translates shell style wildcards into a regular expression matching
+        the whole string.
 
         Arguments:
             pattern (str): Pattern including wildcards
@@ -339,7 +542,7 @@ class DatabaseCopy:
         Return:
             re.Pattern: Regular Expression Object
         """
-        return re.compile(pattern.replace("*", ".*").replace("?", "."))
+        return re.compile(fnmatch.translate(pattern))
 
     @staticmethod
     def get_name(channel):
@@ -387,6 +590,9 @@ class DatabaseCopy:
 
         for key in kwargs.keys():
             name = DatabaseCopy.get_name(channel)
-            logger.warning(f"Channel {name}: Ignored unsupported argument "
-                           f"{key} for {type} transform")
+            logger.warning("Channel %s: Ignored unsupported argument %s for "
+                           "%s transform",
+                           name,
+                           key,
+                           type)
         return f, fargs
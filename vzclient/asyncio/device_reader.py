@@ -28,6 +28,22 @@ class DeviceReader(object):
         name (str): Device name for this reader used in log messages.
         **kwargs: Keyword arguments passed verbatim to reader on each call
     """
+    __slots__ = ("read_device",
+                 "use_device_time",
+                 "sampling_interval",
+                 "interpolate",
+                 "allowed_errors",
+                 "name",
+                 "_reader_args",
+                 "_t0",
+                 "_t1",
+                 "_y0",
+                 "_y1",
+                 "_inv_dt",
+                 "_exec_time",
+                 "_time_convert",
+                 "_stop")
+
     def __init__(self,
                  reader,
                  use_device_time=True,
@@ -48,14 +64,18 @@ class DeviceReader(object):
         self._t1 = None
         self._y0 = None
         self._y1 = None
-        self._exec_time = 10 * [0.]
-        self._pos = 0
+        self._inv_dt = None
+        self._exec_time = 0.
+        self._time_convert = None
         self._stop = True
 
     @property
     def mean_exec_time(self):
-        """Mean execution time (excluding sleep) [s]"""
-        return sum(self._exec_time) / len(self._exec_time)
+        """Mean execution time (excluding sleep) [s]
+
+        Exponential moving average over roughly the last ten samples
+        """
+        return self._exec_time
 
     async def __aiter__(self):
         """Iterate over readings from the device
@@ -76,38 +96,53 @@ class DeviceReader(object):
                 yield self.get_value()
             await asyncio.sleep(sleep_sec)
 
-        # read out loop
+        # read out loop: sleep until absolute deadlines of the loop clock
+        loop = asyncio.get_event_loop()
+        interval = 0.001 * self.sampling_interval
+        deadline = loop.time()
+        t_grid = None  # next interpolation node [ms]
+        offset = 0.  # loop time minus timestamp [s]
         while not self._stop:
             is_ok = await self.update()
-            if is_ok:
+            if not is_ok:
+                deadline = loop.time() + interval
+            else:
                 self.update_exec_time(sleep_sec)
                 if self.interpolate:
-                    i = (self._t1 // self.sampling_interval)
-                    t = i * self.sampling_interval
-                    yield self.get_value(t)
+                    if (t_grid is None or self._t1 < t_grid
+                            or self._t1 >= t_grid + self.sampling_interval):
+                        # (re)synchronize node counter and clock
+                        t_grid = self._t1 - self._t1 % self.sampling_interval
+                        offset = loop.time() - 0.001 * self._t1
+                    yield self.get_value(t_grid)
+                    t_grid += self.sampling_interval
                     # buffer to avoid sampling too early: whatever is lower
                     # 1% of sampling interval or half of exec time
                     dtmin = min(1e-5 * self.sampling_interval,
                                 0.5 * self.mean_exec_time)
-                    sleep_sec = dtmin + 0.001 * (
-                                (i + 1) * self.sampling_interval - self._t1)
+                    deadline = (offset + 0.001 * t_grid + dtmin
+                                - self.mean_exec_time)
                 else:
-                    sleep_sec = 0.001 * self.sampling_interval
                     yield self.get_value()
-
-                sleep_sec -= self.mean_exec_time
-                if sleep_sec < 0.:
-                    logger.warning(f"Mean execution time "
-                                   f"({self.mean_exec_time:.3f} s) for device "
-                                   f"{self.name} exceeds sampling interval by "
-                                   f"{-1000 * sleep_sec:.0f} ms")
-                    sleep_sec = 0.
+                    deadline += interval
+                if self._stop:
+                    break
+
+            sleep_sec = deadline - loop.time()
+            if sleep_sec < 0.:
+                logger.warning("Mean execution time (%.3f s) for device "
+                               "%s exceeds sampling interval by %.0f ms",
+                               self.mean_exec_time,
+                               self.name,
+                               -1000 * sleep_sec)
+                sleep_sec = 0.
+                deadline = loop.time()
             await asyncio.sleep(sleep_sec)
         self._stop = False
 
     async def stop(self, max_retries=5):
         """Stop the reader and wait until the loop is complete"""
-        logger.debug(f"Stopping device reader {self.name} ...")
+        logger.debug("Stopping device reader %s ...", self.name)
         if self._stop:
             return
         self._stop = True
@@ -121,25 +156,32 @@ class DeviceReader(object):
     async def update(self):
         """Update readings from device"""
         try:
-            logger.debug(f"Reading from device '{self.name}'")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Reading from device '%s'", self.name)
             t, y = await self.read_device(**self._reader_args)
         except Exception as ex:
-            logger.error(f"While reading from '{self.name}': {ex}")
-            logger.debug(f"Errors remaining: {self.allowed_errors}")
+            logger.error("While reading from '%s': %s", self.name, ex)
+            logger.debug("Errors remaining: %d", self.allowed_errors)
             if self.allowed_errors == 0:
                 raise
             self.allowed_errors -= 1
             return False
 
-        if self.use_device_time and t is not None:
-            if isinstance(t, datetime):
-                t = timestamp(t)
-            else:
-                t = int(t)
-        else:
+        if t is None or not self.use_device_time:
             t = now()
+        else:
+            convert = self._time_convert
+            if convert is None:
+                # the type of device time does not change between reads
+                convert = timestamp if isinstance(t, datetime) else int
+                self._time_convert = convert
+            t = convert(t)
         self._t0, self._y0 = self._t1, self._y1
         self._t1, self._y1 = t, y
+        if self._t0 is not None and self._t1 != self._t0:
+            self._inv_dt = 1. / (self._t1 - self._t0)
+        else:
+            self._inv_dt = None
         return True
 
     def update_exec_time(self, sleep_time=0.):
@@ -153,10 +195,7 @@ class DeviceReader(object):
         if self._t1 is None or self._t0 is None:
             return
         dt = 0.001 * (self._t1 - self._t0) - sleep_time
-        self._exec_time[self._pos] = dt
-        self._pos += 1
-        if self._pos == len(self._exec_time):
-            self._pos = 0
+        self._exec_time += 0.1 * (dt - self._exec_time)
 
     def get_value(self, t=None):
         """Get last measurement
@@ -174,15 +213,15 @@ class DeviceReader(object):
         if t is None:
             return self._t1, self._y1
 
-        if self._t0 is None or self._y0 is None:
+        if self._inv_dt is None or self._y0 is None:
             raise ValueError("Missing one data point for linear interpolation")
 
-        if t < self._t0:
-             logger.warning("Extrapolating {} ms in the past"
-                            .format(self._t0 - t))
-        elif t > self._t1:
-            logger.warning("Extrapolating {} ms into the future"
-                           .format(t - self._t1))
+        if logger.isEnabledFor(logging.WARNING):
+            if t < self._t0:
+                logger.warning("Extrapolating %d ms in the past", self._t0 - t)
+            elif t > self._t1:
+                logger.warning("Extrapolating %d ms into the future",
+                               t - self._t1)
         # Linear interpolation
-        w = float(t - self._t0) / (self._t1 - self._t0)
-        return t, (1. - w) * self._y0 + w * self._y1
+        w = (t - self._t0) * self._inv_dt
+        return t, self._y0 + w * (self._y1 - self._y0)
@@ -1,7 +1,11 @@
 import asyncio
 import csv
+from itertools import islice
+from operator import itemgetter
 
 class FileDriver:
+    __slots__ = ("_config", "_format", "_parser_config", "_parser", "_file")
+
     def __init__(self, file, format="csv", **kwargs):
         self._config = dict(file=file)
         self._format = format
@@ -17,11 +21,11 @@ class FileDriver:
     async def __aenter__(self):
         if self.is_connected:
             raise RuntimeError("Client already in use")
-        self.connect()
+        await self.connect()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self.disconnect()
+        await self.disconnect()
 
     @property
     def is_connected(self):
@@ -32,25 +36,30 @@ class FileDriver:
         """
         return self._file is not None
 
-    def connect(self, **kwargs):
+    async def connect(self, **kwargs):
         """Connect to a database
 
+        The file is opened in the default executor of the event loop.
+
         Arguments:
             **kwargs: Keyword arguments used for the connection. These
                 arguments will override any arguments passed to init.
         """
         self._config.update(kwargs)
-        self.disconnect()
-        self._file = open(**self._config)
+        await self.disconnect()
+        loop = asyncio.get_event_loop()
+        self._file = await loop.run_in_executor(None,
+                                                lambda: open(**self._config))
         if "w" in self._file.mode:
             self._parser = csv.writer(self._file, **self._parser_config)
         else:
             self._parser = csv.reader(self._file, **self._parser_config)
 
-    def disconnect(self):
+    async def disconnect(self):
         """Disconnect client"""
         if self.is_connected:
-            self._file.close()
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self._file.close)
             self._file = None
 
     def get_reader(self):
@@ -81,21 +90,28 @@ class FileDriver:
                           end=None,
                           chunk_size=8192):
         # TODO begin, end have to be implemented
+        loop = asyncio.get_event_loop()
         while True:
-            chunk = [(row[0], row[1]) for row in self.read_chunk(chunk_size)]
-            if len(chunk) == 0:
+            chunk = await loop.run_in_executor(None, self.read_chunk, chunk_size)
+            if not chunk:
                 return
             yield chunk
-            await asyncio.sleep(0)
 
     def read_chunk(self, size):
-        for i, line in enumerate(self._parser):
-            if i >= size:
-                return
-            yield line
+        """Read the next rows from file
+
+        Arguments:
+            size (int): Maximum number of rows to read
+
+        Return:
+            list: Up to `size` (timestamp, value) tuples taken from the first
+            two columns
+        """
+        return list(map(itemgetter(0, 1), islice(self._parser, size)))
 
     async def write_chunk(self, chunk):
-        for t, x in chunk:
-            self._parser.writerow((t, x))
-            await asyncio.sleep(0)
+        # Materialize the rows here, so arrays are not read from another thread
+        rows = list(chunk)
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._parser.writerows, rows)
 
@@ -1,8 +1,11 @@
+import asyncio
 import logging
+from functools import lru_cache
+from time import monotonic
 from aioinflux import InfluxDB2Client
 from aioinflux.serialization.common import escape, tag_escape
 from aioinflux.serialization.common import measurement_escape, key_escape
-from ..buffer import Buffer
+from ..chunk import Chunk
 
 logger = logging.getLogger("vzclient")
 
@@ -17,6 +20,12 @@ class InfluxDriver(object):
         user (str): MySQL user name
         token (str): MySQL password for ``user``
         db (str): Database identifier
+        connector (aiohttp.BaseConnector): Connector shared between several
+            drivers to pool their HTTP connections. The connector is not
+            closed on disconnect. If ``None``, each driver uses its own
+            connections. Defaults to ``None``.
+        shutdown_timeout (float): Maximum time [s] to send buffered data on
+            exit of an asynchronous with block. Defaults to 10.
         **kwargs: Keyword arguments passed verbatim to mysql.connect
     """
     def __init__(self,
@@ -25,18 +34,32 @@ class InfluxDriver(object):
                  org="volkszaehler",
                  bucket="volkszaehler",
                  ssl=True,
+                 connector=None,
+                 shutdown_timeout=10,
                  **kwargs):
         if secret is None:
             secret = kwargs.pop("token", None)
+        if connector is not None:
+            kwargs.update(connector=connector, connector_owner=False)
         self._client_cfg = dict(host=host,
                                 bucket=bucket,
                                 org=org,
                                 token=secret,
                                 ssl=ssl,
                                 **kwargs)
+        self._shutdown_timeout = shutdown_timeout
         self._connection = None
         self._prefix = b""
-        self._buffer = None
+        self._fragments = []
+        self._buffered = 0
+        self._buffer_size = None
+        self._high_water_mark = None
+        self._flush_interval = None
+        self._t_flush = None
+        self._scale = None
+        self._inflight = None
+        self._pending = set()
+        self._error = None
 
     async def __aenter__(self):
         if self.is_connected:
@@ -47,9 +70,13 @@ class InfluxDriver(object):
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.is_connected:
             try:
-                await self.flush_buffer()
+                await asyncio.wait_for(self.shutdown(),
+                                       timeout=self._shutdown_timeout)
+            except asyncio.TimeoutError:
+                logger.error("Flushing buffer timed out after %ss",
+                             self._shutdown_timeout)
             except Exception as ex:
-                logger.error(f"While flushing buffer: {ex}")
+                logger.error("While flushing buffer: %s", ex)
             await self.disconnect()
 
     @property
@@ -109,34 +136,101 @@ class InfluxDriver(object):
                    measurement="volkszaehler",
                    tags=None,
                    field_name="value",
-                   buffer_size=8192*1024):
+                   buffer_size=8192*1024,
+                   flush_interval=None,
+                   scale=None,
+                   max_inflight=2):
+        """Get a writer for line protocol data
+
+        Arguments:
+            measurement (str): Measurement name
+            tags (dict): Tags added to every point. Defaults to ``None``.
+            field_name (str): Name of the field containing the value.
+            buffer_size (int): Maximum number of bytes sent per request.
+            flush_interval (float): Maximum time [s] data may remain in the
+                buffer before it is flushed. If ``None``, the buffer is only
+                flushed if it is full or on exit. Defaults to ``None``.
+            scale (int): If not ``None``, chunks are expected to contain
+                fixed point integer values, which are divided by `scale` when
+                encoded. Defaults to ``None``.
+            max_inflight (int): Maximum number of write requests running
+                concurrently. The next buffer is filled while requests are in
+                flight. Defaults to 2.
+
+        Return:
+            InfluxDriver: Writer instance
+        """
         client = self.get_client()
         client.init_writer(measurement=measurement,
                            tags=tags,
                            field_name=field_name,
-                           buffer_size=buffer_size)
+                           buffer_size=buffer_size,
+                           flush_interval=flush_interval,
+                           scale=scale,
+                           max_inflight=max_inflight)
         return client
 
     def get_client(self):
         if self.is_connected:
-            return InfluxDriver(**self._client_cfg)
+            return InfluxDriver(shutdown_timeout=self._shutdown_timeout,
+                                **self._client_cfg)
         return self
 
-    def init_writer(self, measurement, tags, field_name, buffer_size):
+    def init_writer(self,
+                    measurement,
+                    tags,
+                    field_name,
+                    buffer_size,
+                    flush_interval=None,
+                    scale=None,
+                    max_inflight=2):
+        if max_inflight < 1:
+            raise ValueError(f"Invalid number of requests: {max_inflight}")
         self._prefix = self.get_prefix(measurement=measurement,
                                        tags=tags,
                                        field_name=field_name)
         max_line_len = len(self._prefix) + 2 * 32  # assume 32 char max per field
-        self._buffer = Buffer(buffer_size, buffer_size - max_line_len)
+        self._fragments = []
+        self._buffered = 0
+        self._buffer_size = int(buffer_size)
+        self._high_water_mark = self._buffer_size - max_line_len
+        self._flush_interval = flush_interval
+        self._t_flush = monotonic()
+        self._scale = scale
+        self._inflight = asyncio.Semaphore(int(max_inflight))
+        self._pending.clear()
+        self._error = None
 
     def init_reader(self):
         raise NotImplementedError("Reader")
 
     async def write_chunk(self, chunk):
-        for t, x in chunk:
-            self._buffer.write(self._prefix, f"{x} {t}\n".encode())
-            if self._buffer.is_full():
-                await self.flush_buffer()
+        """Write a chunk of points
+
+        The chunk is encoded in one pass and kept as one fragment. Fragments
+        are accumulated until `buffer_size` bytes are reached and joined
+        once, when the request is sent. Chunks too large for an empty buffer
+        are split.
+
+        Arguments:
+            chunk (Chunk or list): Chunk or list of (timestamp, value) tuples
+        """
+        data = self.encode_lines(self._prefix, chunk, self._scale)
+        if self._buffered + len(data) > self._buffer_size:
+            await self.flush_buffer()
+            if len(data) > self._buffer_size and len(chunk) > 1:
+                n = len(chunk) // 2
+                await self.write_chunk(chunk[:n])
+                await self.write_chunk(chunk[n:])
+                return
+        self._fragments.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self._high_water_mark:
+            await self.flush_buffer()
+
+        if (self._flush_interval is not None
+                and monotonic() - self._t_flush > self._flush_interval):
+            await self.flush_buffer()
 
     async def iter_chunks(self,
                           channel,
@@ -147,19 +241,140 @@ class InfluxDriver(object):
         raise NotImplementedError("read chunks for Influx driver")
 
     async def flush_buffer(self):
-        if self._buffer:
-            logger.debug(f"Flushing {len(self._buffer)} bytes to influx ...")
-            await self.insert(data=self._buffer.data())
-            self._buffer.clear()
+        """Send the buffer content to the database
+
+        The request is sent in the background, so that the buffer can be
+        refilled while it is in flight. Waits, if the maximum number of
+        requests is already in flight.
+
+        Raise:
+            Exception: Error of a previous request, which failed
+        """
+        self._t_flush = monotonic()
+        self.raise_error()
+        if self._fragments:
+            data = b"".join(self._fragments)
+            self._fragments.clear()
+            self._buffered = 0
+            await self._inflight.acquire()
+            task = asyncio.ensure_future(self.send(data))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def send(self, data):
+        """Send line protocol data and release one request slot afterwards
+
+        Errors are stored and raised by the next call to :meth:`flush_buffer`
+        or :meth:`drain`.
+
+        Arguments:
+            data (bytes): Line protocol data
+        """
+        try:
+            logger.debug("Flushing %d bytes to influx ...", len(data))
+            await self.insert(data=data)
+        except Exception as ex:
+            if self._error is None:
+                self._error = ex
+        finally:
+            self._inflight.release()
+
+    async def shutdown(self):
+        """Send all buffered data and wait until it is written"""
+        await self.flush_buffer()
+        await self.drain()
+
+    async def drain(self):
+        """Wait until all requests in flight are completed
+
+        Raise:
+            Exception: Error of a request, which failed
+        """
+        if self._pending:
+            await asyncio.gather(*self._pending)
+        self.raise_error()
+
+    def raise_error(self):
+        """Raise the error of a failed request, if any"""
+        if self._error is not None:
+            ex, self._error = self._error, None
+            raise ex
+
+    @staticmethod
+    def encode_lines(prefix, chunk, scale=None):
+        """Encode a chunk of points in line protocol
+
+        Arguments:
+            prefix (bytes): Line prefix as returned by :meth:`get_prefix`
+            chunk (iterable): Iterable of (timestamp, value) pairs containing
+                integer timestamps and numeric values
+            scale (int): If not ``None``, values are fixed point integers,
+                which are divided by `scale` to obtain the field value.
+                Defaults to ``None``.
+
+        Return:
+            bytes: One line per point
+        """
+        if scale is not None:
+            if isinstance(chunk, Chunk):
+                chunk = Chunk(chunk.t, chunk.x / scale)
+            else:
+                chunk = [(t, x / scale) for t, x in chunk]
+        # bytes formatting avoids encoding each line separately. Values are
+        # python numbers, whose repr is valid line protocol.
+        if isinstance(chunk, Chunk):
+            # Format all lines with a single call
+            n = len(chunk)
+            args = [None] * (2 * n)
+            args[0::2] = chunk.x.tolist()
+            args[1::2] = chunk.t.tolist()
+            return (InfluxDriver.get_line_template(prefix) * n) % tuple(args)
+        return b"".join([b"%s%r %d\n" % (prefix, x, t) for t, x in chunk])
 
     @staticmethod
     def get_prefix(measurement, tags=None, field_name="value"):
-        # https: // github.com / influxdata / influxdb / issues / 3069
-        if tags is None:
-            tags = dict()
-        tag_str = ",".join("=".join((escape(key, tag_escape),
-                                     escape(tags[key], tag_escape)))
-                           for key in sorted(tags.keys()))
-        meas = escape(measurement, measurement_escape)
-        field = escape(field_name, key_escape)
-        return f"{meas},{tag_str} {field}=".encode("utf-8")
+        """Get the line protocol prefix of points
+
+        Results are cached, since readers and writers with equal arguments
+        share the same prefix.
+
+        Arguments:
+            measurement (str): Measurement name
+            tags (dict): Tags added to every point. Defaults to ``None``.
+            field_name (str): Field name. Defaults to ``"value"``.
+
+        Return:
+            bytes: Escaped measurement, tags and field name up to and including
+            the equal sign preceding the field value
+        """
+        tag_items = tuple(sorted(tags.items())) if tags else ()
+        return _get_prefix(measurement, tag_items, field_name)
+
+    @staticmethod
+    def get_line_template(prefix):
+        """Get a template formatting one line of line protocol
+
+        Arguments:
+            prefix (bytes): Line prefix as returned by :meth:`get_prefix`
+
+        Return:
+            bytes: Template, which formats a line from a (value, timestamp)
+            tuple via the ``%`` operator
+        """
+        return _line_template(prefix)
+
+
+@lru_cache(maxsize=1024)
+def _line_template(prefix):
+    # Template formatting one line from value and timestamp
+    return prefix.replace(b"%", b"%%") + b"%r %d\n"
+
+
+@lru_cache(maxsize=1024)
+def _get_prefix(measurement, tag_items, field_name):
+    # https: // github.com / influxdata / influxdb / issues / 3069
+    parts = [escape(measurement, measurement_escape)]
+    parts.extend("=".join((escape(key, tag_escape), escape(value, tag_escape)))
+                 for key, value in tag_items)
+    field = escape(field_name, key_escape)
+    return f"{','.join(parts)} {field}=".encode("utf-8")
@@ -1,11 +1,24 @@
 import logging
 import asyncio
+import math
+import random
+from collections import deque
+
+import aiohttp
 
 from ..buffer import Buffer
 from .influx_driver import InfluxDriver
 
 logger = logging.getLogger("vzclient")
 
+# Divisors converting timestamps [ms since EPOCH] to the write precision
+TIME_DIVISORS = {"s": 1000, "ms": 1}
+
+# Upper limits of the pause [s] between write retries during normal operation
+# and while the hub is stopping
+MAX_RETRY_DELAY = 30
+MAX_SHUTDOWN_RETRY_DELAY = 1
+
 
 class InfluxHub(object):
     """Relays information from various sources to an influx DB client
@@ -20,14 +33,52 @@ class InfluxHub(object):
             buffer before they are flushed [ms].
         max_retries (int): Maximum number of write attempts on error. Setting
             this value to -1 will lead to infinite retries.
+        max_request_size (int): Chunks waiting in the output queue are
+            combined into one request, until the request contains at least
+            this number of bytes. Defaults to 4000000.
+        max_queued_bytes (int): Maximum number of bytes waiting in the output
+            queue. Readers wait, if the queue grows beyond this size, until
+            the writers have reduced it to half of this size. Defaults to
+            ``math.inf``.
+        flush_threshold (float): Fraction of the buffer size, at which the
+            buffer is flushed to the output queue. Defaults to 0.5.
+        coalesce_time (int): Time [ms] a writer waits for more chunks after
+            the first chunk arrived in an empty queue, so that small chunks
+            are sent in one request. Defaults to 50.
+        precision (str): Precision of the timestamps written to the database.
+            Either ``"ms"`` or ``"s"``. Second precision shortens every line,
+            but points of one reader less than a second apart overwrite each
+            other. Defaults to ``"ms"``.
     """
-    def __init__(self, buffer_size=1000000, max_buffer_age=30000, max_retries=5):
+    def __init__(self,
+                 buffer_size=1000000,
+                 max_buffer_age=30000,
+                 max_retries=5,
+                 max_request_size=4000000,
+                 max_queued_bytes=math.inf,
+                 flush_threshold=0.5,
+                 coalesce_time=50,
+                 precision="ms"):
+        if precision not in TIME_DIVISORS:
+            raise ValueError(f"Invalid timestamp precision: {precision}")
         self.max_buffer_age = int(max_buffer_age)
         self.max_retries = int(max_retries)
-
-        self._output_queue = asyncio.Queue()
-        self._buffer = Buffer(buffer_size)
-        self._t_buffer = None
+        self.max_request_size = int(max_request_size)
+        self.max_queued_bytes = max_queued_bytes
+        self.coalesce_time = int(coalesce_time)
+        self.precision = precision
+
+        self._output_queue = deque()
+        self._output_ready = asyncio.Event()
+        self._storage_pool = deque(maxlen=3)
+        self._queued_bytes = 0
+        self._output_drained = asyncio.Event()
+        self._output_drained.set()
+        # flush early, so writers work while readers fill the next buffer
+        self._buffer = Buffer(buffer_size, int(flush_threshold * buffer_size))
+        self._flusher = None
+        self._connector = None
+        self._stop_event = asyncio.Event()
         self._readers = []
         self._writers = []
         self._future = None
@@ -43,7 +94,9 @@ class InfluxHub(object):
         """Stop this relay instance
 
         Stops all readers, flushes remaining data to output queue and writes
-        data from the queue to Influx before stopping the writer(s).
+        data from the queue to Influx before stopping the writer(s). Readers
+        stop after their next sample and are only cancelled, if they do not
+        stop within their timeout.
 
         The timeout argument is split between readers and writers. If only one
         value is used, 20 % of the timeout will be allowed for readers and the
@@ -65,23 +118,43 @@ class InfluxHub(object):
             t2 = timeout - t1
             timeout = (t1, t2)
 
+        self._stop_event.set()
+        if self._flusher is not None:
+            self._flusher.cancel()
+
         errors = []
         for t, name in zip(timeout, ("readers", "writers")):
             tasks = getattr(self, f"_{name}")
+            if name == "writers":
+                for task in tasks:
+                    task.cancel()
+            logger.debug("Closing %s ...", name)
+            # shield keeps tasks running, which do not finish within timeout
+            gathered = asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await asyncio.wait_for(asyncio.shield(gathered), timeout=t)
+            except asyncio.TimeoutError:
+                if name == "readers":
+                    logger.warning("Cancelling readers, which did not stop "
+                                   "within %ss", t)
+                    for task in tasks:
+                        task.cancel()
+                    await gathered
+            pending = []
             for task in tasks:
-                task.cancel()
-            logger.debug(f"Closing {name} ...")
-            done, pending = await asyncio.wait(tasks, timeout=t)
-            for task in done:
-                try:
-                    await task
-                except Exception as ex:
-                    logger.error(f"{ex}")
+                if not task.done():
+                    pending.append(task)
+                elif not task.cancelled() and task.exception() is not None:
+                    logger.error("%s", task.exception())
             if pending:
                 msg = f"Failed to close {len(pending)} {name}"
                 logger.warning(msg)
                 errors.append(msg)
 
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
         if self._future is not None:
             if errors:
                 self._future.set_exception(TimeoutError("\n".join(errors)))
@@ -100,9 +173,21 @@ class InfluxHub(object):
             **kwargs: Keyword arguments passed verbatim to
                 :meth:`DeviceReader.wrap_reader`
         """
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.ensure_future(self.flush_periodically())
         task = asyncio.ensure_future(self.wrap_reader(reader, **kwargs))
         self._readers.append(task)
 
+    async def flush_periodically(self):
+        """Flush the buffer at intervals of the maximum buffer age
+
+        Do not execute this directly. It is started by :meth:`connect_reader`.
+        """
+        interval = 0.001 * self.max_buffer_age
+        while True:
+            await asyncio.sleep(interval)
+            self.flush_buffer()
+
     def connect_writer(self, host, **kwargs):
         """Start a writer task
 
@@ -144,25 +229,44 @@ class InfluxHub(object):
         prefix = InfluxDriver.get_prefix(measurement=measurement,
                                          tags=tags,
                                          field_name=field_name)
-        name = tags.get("title", "<unknown>")
-        logger.info(f"Started {name} reader for measurement {measurement} ...")
-
+        name = tags.get("title", "<unknown>") if tags else "<unknown>"
+        logger.info("Started %s reader for measurement %s ...",
+                    name,
+                    measurement)
+
+        buffer = self._buffer
+        capacity = buffer.capacity
+        append = buffer.append
+        line = InfluxDriver.get_line_template(prefix)
+        divisor = TIME_DIVISORS[self.precision]
         try:
             async for t, x in reader:
-                if self._t_buffer is None:
-                    self._t_buffer = t
-                self._buffer.write(prefix, f"{x} {t}\n".encode())
-                logger.debug(f"Buffer: ({len(self._buffer)} / "
-                             f"{self._buffer.capacity} bytes) used")
-
-                if self._buffer.is_full():
-                    self.flush_buffer()
-                elif t - self._t_buffer > self.max_buffer_age:
+                if divisor > 1:
+                    t = (t + divisor // 2) // divisor
+                # All readers share the buffer. There is no await between
+                # append and flush, so other readers cannot interleave here.
+                append(line % (x, t))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Buffer: (%d / %d bytes) used",
+                                 len(buffer),
+                                 capacity)
+
+                if buffer.is_full():
                     self.flush_buffer()
-            logger.error(f"{name} reader died unexpectedly")
+
+                if not self._output_drained.is_set():
+                    logger.debug("%s reader waiting for writers ...", name)
+                    await self._output_drained.wait()
+
+                if self._stop_event.is_set():
+                    logger.debug("%s reader stopped.", name)
+                    break
+            else:
+                logger.error("%s reader died unexpectedly", name)
         except asyncio.CancelledError:
+            logger.debug("%s reader cancelled.", name)
+        finally:
             self.flush_buffer()
-            logger.debug(f"{name} reader cancelled.")
 
     async def wrap_writer(self, host, bucket='volkszaehler', **kwargs):
         """Task executed for each data base writer
@@ -173,56 +277,119 @@ class InfluxHub(object):
             host (str): Hostname of Influx DB Server to connect to
             bucket (str): Bucket to write to. Defaults to 'volkszaehler'
             **kwargs: Keyword arguments passed verbatim to
-                :class:`~vzclient.asyncio.InfluxDriver`
+                :class:`~vzclient.asyncio.InfluxDriver`. Unless a connector is
+                specified, all writers share the connector of the hub.
         """
-        logger.debug(f"Starting influx writer for bucket {bucket} on {host} ...")
+        logger.debug("Starting influx writer for bucket %s on %s ...",
+                     bucket,
+                     host)
+        # one client per writer, which keeps its session alive between chunks.
+        # Writers share the connections of one connector.
+        if self._connector is None:
+            self._connector = aiohttp.TCPConnector(ttl_dns_cache=300)
+        kwargs.setdefault("connector", self._connector)
+        client = InfluxDriver(host, bucket=bucket, **kwargs)
+        queue = self._output_queue
         data = None
         retry = 0
         cancel = False
-        while not cancel or not self._output_queue.empty() or data is not None:
-            try:
-                if data is None:
-                    retry = 0
-                    logger.debug(f"Waiting for next chunk ...")
-                    data = await self._output_queue.get()
-
+        try:
+            while not cancel or queue or data is not None:
                 try:
-                    async with InfluxDriver(host,
-                                            bucket=bucket,
-                                            **kwargs) as client:
-                        logger.debug(f"Writing {len(data)} bytes of data to "
-                                     f"bucket {bucket} ...")
-                        await client.insert(data)
+                    if data is None:
+                        retry = 0
+                        if not queue:
+                            while not queue:
+                                logger.debug("Waiting for next chunk ...")
+                                self._output_ready.clear()
+                                await self._output_ready.wait()
+                            if (self.coalesce_time > 0
+                                    and self._queued_bytes
+                                    < self.max_request_size):
+                                await asyncio.sleep(0.001 * self.coalesce_time)
+                        data = self.join_chunks()
+
+                    try:
+                        logger.debug("Writing %d bytes of data to bucket %s ...",
+                                     len(data),
+                                     bucket)
+                        await client.insert(data, precision=self.precision)
                         data = None
-                        self._output_queue.task_done()
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as ex:
+                        # Reconnect on next insert
+                        await client.disconnect()
+                        # TODO we need finer grained error control here
+                        # Maybe no retry on 401 and different behaviour on
+                        # connection problems ?
+                        if self.max_retries < 0 or retry < self.max_retries:
+                            retry += 1
+                            logger.error("While writing: %s. Starting retry "
+                                         "(%d) ...",
+                                         ex,
+                                         retry)
+                            # exponential backoff: 2, 4, 8, ... s with
+                            # jitter, so writers do not retry in lockstep.
+                            # Retry quickly while stopping, so the writer
+                            # finishes within the timeout of stop.
+                            delay = 2 ** min(retry, 5) * (0.5 + random.random())
+                            await asyncio.sleep(min(delay,
+                                                    MAX_SHUTDOWN_RETRY_DELAY
+                                                    if cancel
+                                                    else MAX_RETRY_DELAY))
+                        else:
+                            logger.error("While writing: %s. Ignoring %d bytes "
+                                         "of data",
+                                         ex,
+                                         len(data))
+                            data = None
                 except asyncio.CancelledError:
-                    raise
-                except Exception as ex:
-                    # TODO we need finer grained error control here
-                    # Maybe no retry on 401 and different behaviour on connection
-                    # problems ?
-                    if self.max_retries < 0 or retry < self.max_retries:
-                        retry += 1
-                        logger.error(f"While writing: {ex}. "
-                                     f"Starting retry ({retry}) ...")
-                        await asyncio.sleep(2)
-                    else:
-                        logger.error(f"While writing: {ex}. Ignoring {len(data)}"
-                                     f" bytes of data")
-                        data = None
-                        self._output_queue.task_done()
-            except asyncio.CancelledError:
-                logger.info(f"Writer for bucket {bucket} cancelled. Closing...")
-                cancel = True
-        logger.debug(f"Writer for bucket {bucket} on {host} closed")
+                    logger.info("Writer for bucket %s cancelled. Closing...",
+                                bucket)
+                    cancel = True
+        finally:
+            await client.disconnect()
+        logger.debug("Writer for bucket %s on %s closed", bucket, host)
+
+    def join_chunks(self):
+        """Take chunks from the output queue and join them
+
+        The output queue must not be empty. The buffer storage of the chunks is
+        returned to the storage pool afterwards.
+
+        Return:
+            bytes: Joined data of at least one chunk
+        """
+        queue = self._output_queue
+        data = queue.popleft()
+        size = len(data)
+        chunks = [data]
+        while size < self.max_request_size and queue:
+            chunk = queue.popleft()
+            chunks.append(chunk)
+            size += len(chunk)
+        self._queued_bytes -= size
+        if self._queued_bytes <= 0.5 * self.max_queued_bytes:
+            self._output_drained.set()
+        # aioinflux only accepts bytes, so this is the one copy of the data
+        data = b"".join(chunks)
+        for chunk in chunks:
+            storage = chunk.obj
+            chunk.release()
+            self._storage_pool.append(storage)
+        return data
 
     def flush_buffer(self):
         """Copy buffer content to output queue and clear buffer
         """
-        self._t_buffer = None
         if self._buffer:
-            logger.debug(f"Flushing {len(self._buffer)} bytes to output queue")
-            data = bytes(self._buffer.data())
-            self._buffer.clear()
-            self._output_queue.put_nowait(data)
+            logger.debug("Flushing %d bytes to output queue", len(self._buffer))
+            pool = self._storage_pool
+            data = self._buffer.detach(pool.popleft() if pool else None)
+            self._output_queue.append(data)
+            self._output_ready.set()
+            self._queued_bytes += len(data)
+            if self._queued_bytes > self.max_queued_bytes:
+                self._output_drained.clear()
 
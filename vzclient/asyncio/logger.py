@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from functools import lru_cache
 from uuid import uuid3, NAMESPACE_DNS
 from copy import deepcopy
 
@@ -7,12 +9,31 @@ from .compress import compress_const
 from .influx_hub import InfluxHub
 from ..tool_base import ToolBase
 from ..service import Service
-from ..constants import CHANNEL_TYPES
+from ..constants import CHANNEL_TYPES_BY_NAME
 
 
-SENSOR_TYPES = {s['name'] for s in CHANNEL_TYPES}
+SENSOR_TYPES = frozenset(CHANNEL_TYPES_BY_NAME)
 logger = logging.getLogger("vzclient")
 
+# Modbus clients shared by all readers of a host. Maps the client arguments
+# to a (client, lock) tuple.
+_modbus_clients = dict()
+
+
+@lru_cache(maxsize=4096)
+def auto_uuid(message_id, device_id):
+    """Get the UUID of a message read from a device
+
+    Arguments:
+        message_id (int or str): Message ID
+        device_id (str): Device ID
+
+    Return:
+        str: UUID formed from ``"<message_id>.<device_id>"`` via uuid3 and
+        NAMESPACE_DNS
+    """
+    return str(uuid3(NAMESPACE_DNS, f"{message_id}.{device_id}"))
+
 
 async def modbus_read(client,
                       host,
@@ -24,7 +45,8 @@ async def modbus_read(client,
     """Wrapper function reading a modbus register
 
     This function can be passed as `reader` argument to
-    :class:`vzclient.asyncio.DeviceReader`.
+    :class:`vzclient.asyncio.DeviceReader`. Readers of the same host share a
+    persistent connection. See :func:`get_modbus_client`.
 
     Arguments:
         client (type): Client type to use for the reader. A type like
@@ -41,18 +63,65 @@ async def modbus_read(client,
         tuple: timestamp (local UTC [ms since EPOCH]) and value read from
         host.
     """
-    logger.info(f"Connecting to {host} ...")
-    async with client(host=host, api=api, **kwargs) as cli:
-        if not cli.is_connected():
-            logger.error(f"Modbus connection to {host} failed")
-        value = await cli.get(message)
-        if precision is not None:
-            value = round(value, precision)
-    logger.debug(f"Got {message_name} ({message}) of {value} from {host}")
+    cli, lock = get_modbus_client(client, host, api, **kwargs)
+    async with lock:
+        try:
+            if not cli.is_connected():
+                logger.info("Connecting to %s ...", host)
+                await cli.__aenter__()
+                if not cli.is_connected():
+                    logger.error("Modbus connection to %s failed", host)
+            value = await cli.get(message)
+        except Exception:
+            # Reconnect on next read
+            await cli.__aexit__(None, None, None)
+            raise
+    if precision is not None:
+        value = round(value, precision)
+    logger.debug("Got %s (%s) of %s from %s",
+                 message_name,
+                 message,
+                 value,
+                 host)
     t = None
     return t, value
 
 
+def get_modbus_client(client, host, api, **kwargs):
+    """Get the modbus client shared by all readers with equal arguments
+
+    The client is created on first use and connected by :func:`modbus_read`.
+    It stays connected between reads, so that readers of one host share a
+    single connection.
+
+    Arguments:
+        client (type): Client type
+        host (str): Host address
+        api (dict): Modbus API.
+        **kwargs: Keyword arguments passed to the client.
+
+    Return:
+        tuple: Client instance and :class:`asyncio.Lock` serializing requests
+        sent via the client
+    """
+    key = (client, host, id(api), repr(sorted(kwargs.items())))
+    try:
+        return _modbus_clients[key]
+    except KeyError:
+        entry = (client(host=host, api=api, **kwargs), asyncio.Lock())
+        _modbus_clients[key] = entry
+        return entry
+
+
+async def close_modbus_clients():
+    """Disconnect and remove all shared modbus clients"""
+    while _modbus_clients:
+        _, (cli, lock) = _modbus_clients.popitem()
+        async with lock:
+            if cli.is_connected():
+                await cli.__aexit__(None, None, None)
+
+
 class InfluxLogger(ToolBase):
     """Base class for logging to influx database
 
@@ -78,7 +147,10 @@ class InfluxLogger(ToolBase):
         async with Service(callback=hub.stop) as service:
             hub.connect_writer(**self.influx_config)
             self.connect_to_hub(hub)
-            await hub
+            try:
+                await hub
+            finally:
+                await close_modbus_clients()
         return 0
 
     def configure_logging(self, **kwargs):
@@ -95,9 +167,23 @@ class InfluxLogger(ToolBase):
         buffer_size = influx_cfg.pop('buffer_size', 100000)
         max_buffer_age = int(1000 * influx_cfg.pop('max_buffer_age'))
         max_retries = int(influx_cfg.pop('max_retries'))
+        max_request_size = int(influx_cfg.pop('max_request_size', 4000000))
+        max_queued_bytes = influx_cfg.pop('max_queued_bytes', None)
         self.hub_config.update(buffer_size=buffer_size,
                                max_buffer_age=max_buffer_age,
-                               max_retries=max_retries)
+                               max_retries=max_retries,
+                               max_request_size=max_request_size)
+        if max_queued_bytes is not None:
+            self.hub_config.update(max_queued_bytes=int(max_queued_bytes))
+        if 'flush_threshold' in influx_cfg:
+            flush_threshold = float(influx_cfg.pop('flush_threshold'))
+            self.hub_config.update(flush_threshold=flush_threshold)
+        if 'coalesce_time' in influx_cfg:
+            coalesce_time = int(1000 * influx_cfg.pop('coalesce_time'))
+            self.hub_config.update(coalesce_time=coalesce_time)
+        if 'precision' in influx_cfg:
+            precision = str(influx_cfg.pop('precision'))
+            self.hub_config.update(precision=precision)
 
         if driver != "influx":
             raise ValueError(f"Invalid destination driver: {driver}")
@@ -118,8 +204,8 @@ class InfluxLogger(ToolBase):
                     channels = cfg.pop("channel")
                 except KeyError:
                     nerr += 1
-                    self.log.error(f"In log {i}: "
-                                   f"Missing mandatory keyword 'channel'")
+                    self.log.error("In log %d: Missing mandatory keyword "
+                                   "'channel'", i)
                     continue
             else:
                 channels = log
@@ -128,15 +214,15 @@ class InfluxLogger(ToolBase):
             try:
                 src_cfg = log_cfg.pop("source")
             except KeyError:
-                self.log.error(
-                    f"In log {i}: Missing mandatory source section")
+                self.log.error("In log %d: Missing mandatory source section",
+                               i)
                 nerr += 1
                 continue
             try:
                 driver = src_cfg.pop("driver")
             except KeyError:
-                self.log.error(f"In log {i}, source section: "
-                               f"Missing mandatory driver keyword")
+                self.log.error("In log %d, source section: Missing mandatory "
+                               "driver keyword", i)
                 nerr += 1
                 continue
             try:
@@ -145,7 +231,7 @@ class InfluxLogger(ToolBase):
                                   source=src_cfg,
                                   **log_cfg)
             except Exception as ex:
-                self.log.error(f"In log {i}: {ex}")
+                self.log.error("In log %d: %s", i, ex)
                 nerr += 1
         if nerr:
             raise RuntimeError(f"Encountered {nerr} error(s) in log file")
@@ -217,7 +303,8 @@ class InfluxLogger(ToolBase):
             **kwargs: Keyword arguments passed verbatim to
                 :meth:`add_modbus_reader`.
         """
-        payloads = set(self.iter_channels(driver, channels))
+        # dict removes duplicates, but keeps the configured order
+        payloads = dict.fromkeys(self.iter_channels(driver, channels))
         api = self.get_modbus_api(driver)
         client = self.get_client(driver)
         kwargs.update(source)
@@ -299,7 +386,9 @@ class InfluxLogger(ToolBase):
                                    **tags),
                                field_name=field_name))
 
-        self.log.info(f"Configured modbus channel {name} ({payload.address})")
+        self.log.info("Configured modbus channel %s (%s)",
+                      name,
+                      payload.address)
 
     def iter_channels(self, driver, channels):
         """Iterate over all channels for a specific driver
@@ -402,8 +491,9 @@ class InfluxLogger(ToolBase):
             type = self.get_sensor_type(driver, channel)
         if type:
             if type not in SENSOR_TYPES:
-                logger.warning(f"In message {title}: unknown sensor type "
-                               f"'{type}'")
+                logger.warning("In message %s: unknown sensor type '%s'",
+                               title,
+                               type)
                 tags['type'] = type
 
         if unit == "auto":
@@ -416,7 +506,7 @@ class InfluxLogger(ToolBase):
             if message_id is None:
                 message_id = self.get_name(driver, channel)
             device_id = device_id if device_id is not None else str(host)
-            uuid = str(uuid3(NAMESPACE_DNS, f"{message_id}.{device_id}"))
+            uuid = auto_uuid(message_id, device_id)
         if uuid:
             tags['uuid'] = uuid
 
@@ -425,5 +515,5 @@ class InfluxLogger(ToolBase):
 
     def connect_to_hub(self, hub):
         for log in self._logs:
-            self.log.info(f"Connecting reader {log['reader'].name} ...")
+            self.log.info("Connecting reader %s ...", log['reader'].name)
             hub.connect_reader(**log)
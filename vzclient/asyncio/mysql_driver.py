@@ -1,7 +1,12 @@
+import asyncio
 import aiomysql as sql
 from collections import namedtuple
+from contextlib import asynccontextmanager
 from datetime import datetime
+from itertools import groupby, islice
+from operator import itemgetter
 from ..constants import timestamp
+from ..chunk import Chunk, WITH_NUMPY
 
 Entity = namedtuple("Entity", ("id", "uuid", "type", "cls"))
 Entity.__doc__ = """Namedtuple for rows of the 'entities' table
@@ -29,6 +34,12 @@ class MySqlDriver(object):
         password (str): MySQL password for ``user``
         db (str): Database identifier
         charset (str): Character set to use. Defaults to "utf-8"
+        pool_size (int): Maximum number of connections handed out by
+            :meth:`acquire`. Defaults to 10.
+        pool_recycle (float): Idle connections of the pool older than this
+            number of seconds are replaced by new ones, so that the server
+            does not close them underneath the pool. If -1, connections are
+            never recycled. Defaults to -1.
         **kwargs (dict): Keyword arguments passed verbatim to mysql.connect
     """
     def __init__(self,
@@ -37,6 +48,8 @@ class MySqlDriver(object):
                  secret=None,
                  database=None,
                  charset="utf8",
+                 pool_size=10,
+                 pool_recycle=-1,
                  **kwargs):
         if secret is None:
             secret = kwargs.pop("password", None)
@@ -50,6 +63,11 @@ class MySqlDriver(object):
                                 **kwargs)
         self._connection = None
         self._cursor = None
+        self._pool = None
+        self._pool_size = int(pool_size)
+        self._pool_recycle = pool_recycle
+        self._channel_id = None
+        self._batch_size = None
 
     async def __aenter__(self):
         if self.is_connected:
@@ -96,11 +114,88 @@ class MySqlDriver(object):
             await self.connect()
 
     def get_reader(self):
-        return self.get_client()
+        """Get a reader
 
-    def get_writer(self):
-        client = self.get_client()
-        client.init_writer()
+        Return:
+            Asynchronous context manager yielding a connected reader. See
+            :meth:`acquire`.
+        """
+        return self.acquire()
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Check out a connection from the connection pool of this driver
+
+        The pool is created on first use. Use as
+            async with driver.acquire() as client:
+                ...
+
+        Yield:
+            MySqlDriver: Client connected via a pooled connection
+        """
+        if self._pool is None:
+            # store the task, so concurrent callers share one pool
+            self._pool = asyncio.ensure_future(
+                sql.create_pool(minsize=0,
+                                maxsize=self._pool_size,
+                                pool_recycle=self._pool_recycle,
+                                **self._client_cfg))
+        future = self._pool
+        try:
+            pool = await future
+        except BaseException:
+            # do not cache a failed attempt, the next caller tries again
+            if self._pool is future:
+                self._pool = None
+            raise
+        connection = await pool.acquire()
+        client = MySqlDriver(**self._client_cfg)
+        try:
+            client._connection = connection
+            client._cursor = await connection.cursor()
+            yield client
+        finally:
+            if client._cursor is not None and not client._cursor.closed:
+                await client._cursor.close()
+            client._connection = None
+            client._cursor = None
+            # the pool closes connections with an open transaction instead of
+            # reusing them, which SELECT leaves behind without autocommit
+            if not connection.closed and connection.get_transaction_status():
+                try:
+                    await connection.rollback()
+                except Exception:
+                    connection.close()
+            pool.release(connection)
+
+    async def close(self):
+        """Disconnect and close the connection pool"""
+        await self.disconnect()
+        if self._pool is not None:
+            future, self._pool = self._pool, None
+            try:
+                pool = await future
+            except Exception:
+                return
+            pool.close()
+            await pool.wait_closed()
+
+    def get_writer(self, channel_id, batch_size=1000):
+        """Get a writer inserting measurements into the data table
+
+        Arguments:
+            channel_id (int): ID of the channel (as defined in entities table)
+                the measurements belong to
+            batch_size (int): Maximum number of rows inserted per statement.
+                Defaults to 1000.
+
+        Return:
+            MySqlDriver: New writer instance with its own connection, which
+            is opened, when the writer is entered.
+        """
+        # never initialise self, it may be shared by several channels
+        client = MySqlDriver(**self._client_cfg)
+        client.init_writer(channel_id, batch_size=batch_size)
         return client
 
     def get_client(self):
@@ -108,8 +203,9 @@ class MySqlDriver(object):
             return MySqlDriver(**self._client_cfg)
         return self
 
-    def init_writer(self):
-        raise NotImplementedError("Writer")
+    def init_writer(self, channel_id, batch_size=1000):
+        self._channel_id = int(channel_id)
+        self._batch_size = int(batch_size)
 
     async def iter_chunks(self,
                           channel,
@@ -126,20 +222,42 @@ class MySqlDriver(object):
             yield chunk
         return
 
-    async def write_chunk(self, **kwargs):
-        raise NotImplementedError("write_chunks for mysql driver")
+    async def write_chunk(self, chunk):
+        """Insert a chunk of points and commit them
+
+        Rows are inserted with multi-row INSERT statements of up to
+        `batch_size` rows each.
+
+        Arguments:
+            chunk (Chunk or list): Chunk or list of (timestamp, value) tuples
+        """
+        if self._channel_id is None:
+            raise RuntimeError("Writer not initialized")
+        if isinstance(chunk, Chunk):
+            chunk = zip(chunk.t.tolist(), chunk.x.tolist())
+        channel_id = self._channel_id
+        query = ("INSERT INTO data (channel_id, timestamp, value) "
+                 "VALUES (%s, %s, %s)")
+        await self.execute_many(query,
+                                ((channel_id, t, x) for t, x in chunk),
+                                batch_size=self._batch_size)
+        await self._connection.commit()
 
     async def get_channels(self):
         if not self.is_connected:
             raise RuntimeError("Reader not initialized")
-        entities = await self.entities()
+        # one query instead of one per entity
+        rows = await self.query("SELECT e.id, e.uuid, e.type, e.class, "
+                                "p.pkey, p.value "
+                                "FROM entities e LEFT JOIN properties p "
+                                "ON p.entity_id = e.id ORDER BY e.id")
         properties = []
-        for entity in entities:
-            p = await self.channel_properties(entity.id)
-            p.update(uuid=entity.uuid,
-                     cls=entity.cls,
-                     type=entity.type,
-                     id=entity.id)
+        for entity, group in groupby(rows, key=itemgetter(0, 1, 2, 3)):
+            p = {row[4]: row[5] for row in group if row[4] is not None}
+            p.update(uuid=entity[1],
+                     cls=entity[3],
+                     type=entity[2],
+                     id=entity[0])
             properties.append(p)
         return properties
 
@@ -155,6 +273,55 @@ class MySqlDriver(object):
         result = await self._cursor.fetchall()
         return result
 
+    async def execute_many(self, query, args, batch_size=1000):
+        """Execute a statement once for every set of arguments
+
+        Arguments are sent in batches. For INSERT and REPLACE statements the
+        driver combines each batch into a single multi-row statement. The
+        transaction is not committed.
+
+        Arguments:
+            query (str): Statement with placeholders
+            args (iterable): Iterable of argument tuples
+            batch_size (int): Maximum number of argument tuples sent per
+                round trip. Keep the statements below ``max_allowed_packet``.
+                Defaults to 1000.
+
+        Return:
+            int: Number of affected rows
+        """
+        await self.assert_connected()
+        it = iter(args)
+        nrows = 0
+        while True:
+            batch = list(islice(it, batch_size))
+            if not batch:
+                return nrows
+            nrows += await self._cursor.executemany(query, batch)
+
+    async def iter_query(self, query, *args, size=8192):
+        """Stream the result of a query in chunks
+
+        Uses an unbuffered server side cursor, so only one chunk of the
+        result is held in memory at any time.
+
+        Arguments:
+            query (str): Query string
+            *args : Arguments used to fill the query
+            size (int): Maximum number of rows per chunk. Defaults to 8192.
+
+        Yields:
+            list: Up to `size` rows of the query result
+        """
+        await self.assert_connected()
+        async with self._connection.cursor(sql.SSCursor) as cursor:
+            await cursor.execute(query, args)
+            while True:
+                rows = await cursor.fetchmany(size)
+                if not rows:
+                    return
+                yield rows
+
     async def select(self, table, where=None, limit=None, offset=None, order=None):
         """Select items from a specific table
 
@@ -175,6 +342,7 @@ class MySqlDriver(object):
             list: Query result
         """
         query = [f"SELECT * FROM {table}"]
+        args = []
         if where is not None:
             query.append(f"WHERE {where}")
 
@@ -182,11 +350,13 @@ class MySqlDriver(object):
             query.append(f"ORDER BY {order}")
 
         if limit is not None:
-            query.append(f"LIMIT {limit:d}")
+            query.append("LIMIT %s")
+            args.append(int(limit))
 
         if offset is not None:
-            query.append(f"OFFSET {offset:d}")
-        res = await self.query(" ".join(query))
+            query.append("OFFSET %s")
+            args.append(int(offset))
+        res = await self.query(" ".join(query), *args)
         return res
 
     async def entities(self, **kwargs):
@@ -239,14 +409,12 @@ class MySqlDriver(object):
             dict: Dictionary with channel title as key and channel information
             as :class:`Entity` instance.
         """
-        channels = {}
-        entities = await self.entities(where="class = 'channel'")
-        for e in entities:
-            where = "entity_id = {} and pkey = 'title'".format(e.id)
-            properties = await self.properties(where=where)
-            assert len(properties) == 1
-            channels[properties[0].value] = e
-        return channels
+        # one query instead of one per channel
+        rows = await self.query("SELECT e.id, e.uuid, e.type, e.class, p.value "
+                                "FROM entities e JOIN properties p "
+                                "ON p.entity_id = e.id "
+                                "WHERE e.class = 'channel' AND p.pkey = 'title'")
+        return {row[-1]: Entity(*row[:-1]) for row in rows}
 
     async def channel_properties(self, entity_id):
         """Get information about a channel's properties
@@ -271,35 +439,34 @@ class MySqlDriver(object):
                measurements with timestamp smaller than this value are
                returned. Defalts to ``None``.
             limit (int): Chunk size. Determines the maximum number of
-                measurements returned per query. Defaults to 512.
+                measurements returned per chunk. Defaults to 512.
 
         Yields:
-            list: One tuple containing timestamp and associated value per
-            matching row.
+            Chunk: Timestamps and values of the matching rows. If numpy is
+            not available, a list containing one (timestamp, value) tuple per
+            matching row is yielded instead.
         """
-        if end is not None:
-            t1 = timestamp(end) if isinstance(end, datetime) else int(end)
-            end_query = f" AND timestamp < {t1}"
-        else:
-            end_query = ""
-        where_const = f"channel_id = {channel}{end_query}"
-
-        # Do not use offset, as it is incredibly slow:
-        # https://www.eversql.com/faster-pagination-in-mysql-why-order-by-with-limit-and-offset-is-slow/
-        # channel_id, timestamp combination should be unique (forms an index)
-
+        # Bound parameters are escaped by the driver, so the query text only
+        # depends on which bounds are given.
+        where = ["channel_id = %s"]
+        args = [int(channel)]
         if begin is not None:
-            t0 = timestamp(begin) if isinstance(begin, datetime) else int(end)
-            where = f"{where_const} AND timestamp >= {t0}"
-        else:
-            where = where_const
+            where.append("timestamp >= %s")
+            args.append(timestamp(begin) if isinstance(begin, datetime)
+                        else int(begin))
 
-        while True:
-            chunk = await self.data(where=where,
-                                    limit=limit,
-                                    order="timestamp ASC")
-            if not chunk:
-                return
-
-            yield [(m.timestamp, m.value) for m in chunk]
-            where = f"{where_const} AND timestamp > {chunk[-1].timestamp}"
+        if end is not None:
+            where.append("timestamp < %s")
+            args.append(timestamp(end) if isinstance(end, datetime)
+                        else int(end))
+
+        # Stream the result through a single server side cursor instead of
+        # paginating. channel_id, timestamp combination forms an index.
+        where = " AND ".join(where)
+        query = (f"SELECT timestamp, value FROM data WHERE {where} "
+                 f"ORDER BY timestamp ASC")
+        async for rows in self.iter_query(query, *args, size=limit):
+            if WITH_NUMPY:
+                yield Chunk.from_points(rows)
+            else:
+                yield list(rows)
@@ -1,8 +1,7 @@
-try:
+from ..chunk import Chunk, WITH_NUMPY
+
+if WITH_NUMPY:
     import numpy as np
-    WITH_NUMPY = True
-except ImportError:
-    WITH_NUMPY = False
 
 async def chunk_trafo(aiterable, trafo, **kwargs):
     """Compresses a time series by reducing number of nodes for const periods
@@ -22,11 +21,39 @@ async def chunk_trafo(aiterable, trafo, **kwargs):
 
 if WITH_NUMPY:
     def linear(chunk, scale=1., offset=0.):
-        a = np.fromiter((x for t,x in chunk), dtype=np.float64)
-        a *= scale
-        a += offset
-        return [(t, x) for (t, _,), x in zip(chunk, a)]
+        if isinstance(chunk, Chunk):
+            x = np.multiply(chunk.x, scale, dtype=np.float64)
+            x += offset
+            return Chunk(chunk.t, x)
+        # Python floats, since the repr of numpy scalars is no line protocol
+        return [(t, scale * x + offset) for t, x in chunk]
 else:
     def linear(chunk, scale=1., offset=0.):
         return [(t, scale * x + offset) for t, x in chunk]
 
+
+if WITH_NUMPY:
+    INT32_MAX = np.iinfo(np.int32).max
+
+    def quantize(chunk, scale=1):
+        """Convert values to fixed point integers
+
+        Values are stored as 32 bit integers, if the whole chunk fits into this
+        type and as 64 bit integers otherwise.
+
+        Arguments:
+            chunk (Chunk or list): Chunk or list of (timestamp, value) tuples
+            scale (int): Values are multiplied with scale and rounded to the
+                next integer.
+
+        Return:
+            Chunk or list: Chunk of the same type as `chunk` with integer values
+        """
+        if isinstance(chunk, Chunk):
+            x = np.rint(scale * chunk.x)
+            small = not len(x) or np.abs(x).max() <= INT32_MAX
+            return Chunk(chunk.t, x.astype(np.int32 if small else np.int64))
+        return [(t, int(round(scale * x))) for t, x in chunk]
+else:
+    def quantize(chunk, scale=1):
+        return [(t, int(round(scale * x))) for t, x in chunk]
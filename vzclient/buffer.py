@@ -9,6 +9,7 @@ class Buffer(object):
     """
     def __init__(self, capacity, high_water_mark=None):
         self._storage = bytearray(capacity)
+        self._view = memoryview(self._storage)
         self._bytes_in_buffer = 0
         self._high_water_mark = 0
 
@@ -55,13 +56,38 @@ class Buffer(object):
         """Clear all content from buffer"""
         self._bytes_in_buffer = 0
 
+    def detach(self, storage=None):
+        """Detach the buffer content from this buffer
+
+        The buffer continues with new, empty storage. The detached content
+        is not copied.
+
+        Arguments:
+            storage (bytearray): Storage to continue with. Must have the
+                capacity of this buffer. If ``None``, new storage is
+                allocated. Defaults to ``None``.
+
+        Return:
+            memoryview: View of the buffer content. Its ``obj`` attribute is
+            the detached storage, which can be passed to a later call.
+        """
+        if storage is None:
+            storage = bytearray(self.capacity)
+        elif len(storage) != self.capacity:
+            raise ValueError(f"Invalid storage size ({len(storage)})")
+        data = self._view[:self._bytes_in_buffer]
+        self._storage = storage
+        self._view = memoryview(storage)
+        self._bytes_in_buffer = 0
+        return data
+
     def data(self):
-        """Get a view of the data
+        """Get a copy of the data
 
         Return:
-            view: View of the data
+            bytes: Copy of the buffer content
         """
-        return self._storage[:self._bytes_in_buffer]
+        return self._view[:self._bytes_in_buffer].tobytes()
 
     def is_full(self):
         """Check if buffer content is below water mark
@@ -72,9 +98,33 @@ class Buffer(object):
         """
         return self._bytes_in_buffer >= self._high_water_mark
 
+    def append(self, data):
+        """Append a single bytes object to buffer
+
+        Faster than :meth:`write` for a single argument.
+
+        Arguments:
+            data (bytes): Data to append
+
+        Return:
+            int: Number of bytes written to buffer
+
+        Raise:
+            BufferError: If buffer capacity is exceeded
+        """
+        begin = self._bytes_in_buffer
+        end = begin + len(data)
+        if end > len(self._storage):
+            raise BufferError("Overflow")
+        self._view[begin:end] = data
+        self._bytes_in_buffer = end
+        return end - begin
+
     def write(self, *args):
         """Write data to buffer
 
+        Either all arguments are written or none of them.
+
         Arguments:
             args: Bytes objects to write to the buffer
 
@@ -85,12 +135,14 @@ class Buffer(object):
             BufferError: If buffer capacity is exceeded
         """
         offset = self._bytes_in_buffer
+        view = self._view
+        if offset + sum(map(len, args)) > len(view):
+            raise BufferError("Overflow")
+        end = offset
         for x in args:
-            begin = self._bytes_in_buffer
+            begin = end
             end = begin + len(x)
-            if end > self.capacity:
-                raise BufferError("Overflow")
-            self._storage[begin:end] = x
-            self._bytes_in_buffer = end
-        return self._bytes_in_buffer - offset
+            view[begin:end] = x
+        self._bytes_in_buffer = end
+        return end - offset
 
@@ -0,0 +1,56 @@
+try:
+    import numpy as np
+    WITH_NUMPY = True
+except ImportError:
+    WITH_NUMPY = False
+
+
+class Chunk(object):
+    """Chunk of a time series stored as two arrays
+
+    Stores timestamps and values of a time series in two separate numpy arrays
+    instead of a list of (timestamp, value) tuples. A chunk behaves like a
+    sequence of (timestamp, value) tuples, so it can be passed to consumers
+    expecting the latter.
+
+    Arguments:
+        t (numpy.ndarray): Timestamps [ms since EPOCH]
+        x (numpy.ndarray): Values. Must have the same length as `t`.
+    """
+    __slots__ = ("t", "x")
+
+    def __init__(self, t, x):
+        if len(t) != len(x):
+            raise ValueError("Timestamps and values differ in length")
+        self.t = t
+        self.x = x
+
+    def __len__(self):
+        """Get number of points in chunk"""
+        return len(self.t)
+
+    def __iter__(self):
+        """Iterate over (timestamp, value) tuples of native python types"""
+        return zip(self.t.tolist(), self.x.tolist())
+
+    def __getitem__(self, key):
+        """Get a slice of the chunk or a single (timestamp, value) tuple"""
+        if isinstance(key, slice):
+            return Chunk(self.t[key], self.x[key])
+        return self.t[key].item(), self.x[key].item()
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    @classmethod
+    def from_points(cls, points):
+        """Create a chunk from (timestamp, value) tuples
+
+        Arguments:
+            points (sequence): Sequence of (timestamp, value) tuples
+
+        Return:
+            Chunk: Chunk containing the same points
+        """
+        a = np.array(points, dtype=[("t", np.int64), ("x", np.float64)])
+        return cls(a["t"], a["x"])
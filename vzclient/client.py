@@ -1,5 +1,12 @@
+from time import monotonic
+
 import requests
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 class Client(object):
     """Client for the Volkszaehler API
@@ -9,8 +16,18 @@ class Client(object):
 
     `Volkszaehler API reference`_
 
+    Requests share one `requests.Session`_, which keeps connections to the
+    middleware alive between requests. Can be used in a with block, which
+    closes the session on exit.
+
     Arguments:
         url (str): URL of the volkszähler middleware API
+        cache_ttl (float): Time [s] the result of :meth:`list_channels` is
+            cached. If 0, the channel list is fetched on every call. Defaults
+            to 0.
+
+    .. _requests.Session:
+        https://2.python-requests.org/en/master/api/#requests.Session
 
     .. _Volkszaehler:
         https://volkszaehler.org
@@ -18,8 +35,22 @@ class Client(object):
     .. _Volkszaehler API reference:
         https://wiki.volkszaehler.org/development/api/reference
     """
-    def __init__(self, url):
+    def __init__(self, url, cache_ttl=0):
         self.api = url
+        self.cache_ttl = cache_ttl
+        self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the session and its connections"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
     @property
     def api(self):
@@ -40,6 +71,7 @@ class Client(object):
         self._api = str(url)
         if self._api.endswith("/"):
             self._api = self.api[:-1]
+        self._channels = None
 
     def get(self, *args, **kwargs):
         """Get information from volkszaehler middleware
@@ -69,13 +101,23 @@ class Client(object):
     def list_channels(self):
         """Get list of available (public) channels
 
+        The list is cached for `cache_ttl` seconds. Every call returns a new
+        list, but the channel dictionaries are shared with the cache and must
+        not be modified.
+
         Return:
-            dict: Dictionary containing channel information
+            list: List containing one dictionary with information per channel
         """
+        if self._channels is not None and monotonic() < self._channels[0]:
+            return list(self._channels[1])
         reply = self.get("channel", format="json")
         if not reply.ok:
             raise ConnectionError("html error", reply.status_code)
-        return reply.json()["channels"]
+        channels = json_loads(reply.content)["channels"]
+        if self.cache_ttl > 0:
+            self._channels = (monotonic() + self.cache_ttl, channels)
+            return list(channels)
+        return channels
 
     def url(self, context, id, format):
         """Create volkszaehler url
@@ -142,6 +184,8 @@ class Client(object):
         .. _requests Response:
             https://2.python-requests.org/en/master/api/#requests.Response
         """
-        return requests.request(method=method,
-                                url=self.url(context, id, format),
-                                **kwargs)
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session.request(method=method,
+                                     url=self.url(context, id, format),
+                                     **kwargs)
@@ -1,4 +1,20 @@
 
+try:
+    import numpy as np
+    WITH_NUMPY = True
+except ImportError:
+    WITH_NUMPY = False
+
+try:
+    from numba import njit
+    WITH_NUMBA = WITH_NUMPY
+except ImportError:
+    WITH_NUMBA = False
+
+
+__all__ = ["Compressor", "compress_const"]
+
+
 class Compressor(object):
     """Compresses const phases within a time series
 
@@ -9,6 +25,8 @@ class Compressor(object):
          x0: Initial x value.  Defaults to ``None``. For expert users only.
          y0: Initial y value.  Defaults to ``None``. For expert users only.
     """
+    __slots__ = ("max_gap", "_x0", "_y0", "_xn", "_yn")
+
     def __init__(self, max_gap=None, x0=None, y0=None):
         self.max_gap = max_gap
         self._x0, self._y0 = (x0, y0)
@@ -33,6 +51,15 @@ class Compressor(object):
         yield from self.finalize()
         return
 
+    @property
+    def is_initialized(self):
+        """Check if the compressor has received at least one node
+
+        Return:
+            bool: True if and only if the compressor holds a node
+        """
+        return self._x0 is not None
+
     def iter(self, iterable):
         """Initialize compressor from iterable
 
@@ -51,6 +78,9 @@ class Compressor(object):
     def compress(self, chunk):
         """Compress a chunk of values
 
+        The state of the compressor is updated, when the returned generator is
+        exhausted or closed.
+
         Arguments:
             chunk (iterable): Input time series. Iterable of (x, y) values
                 to compress.
@@ -58,23 +88,101 @@ class Compressor(object):
         Yield:
             tuple: Elements of the compressed time series
         """
-        for x, y in chunk:
-            if x == self._xn:
-                continue
+        # State is kept in locals inside the loop and stored on exit
+        max_gap = self.max_gap
+        x0, y0, xn, yn = self._x0, self._y0, self._xn, self._yn
+        try:
+            for x, y in chunk:
+                if x == xn:
+                    continue
 
-            if y == self._yn:
-                if self.max_gap is not None and x - self._x0 > self.max_gap:
-                    yield self._x0, self._y0
-                    self._x0, self._y0 = self._xn, self._yn
-                self._xn = x
-                continue
+                if y == yn:
+                    if max_gap is not None and x - x0 > max_gap:
+                        yield x0, y0
+                        x0, y0 = xn, yn
+                    xn = x
+                    continue
+
+                yield x0, y0
+                if xn != x0:
+                    yield xn, yn
 
-            yield self._x0, self._y0
-            if self._xn != self._x0:
-                yield self._xn, self._yn
+                x0, y0 = x, y
+                xn, yn = x, y
+        finally:
+            self._x0, self._y0, self._xn, self._yn = x0, y0, xn, yn
+
+    def compress_arrays(self, x, y):
+        """Compress a chunk of values given as arrays
+
+        Vectorized equivalent of :meth:`compress`, which requires numpy. If
+        ``max_gap`` is set, the chunk is compressed element by element.
+
+        Arguments:
+            x (numpy.ndarray): Timestamps (x-coordinates) of the chunk
+            y (numpy.ndarray): Values (y-coordinates) of the chunk
 
-            self._x0, self._y0 = x, y
+        Return:
+            tuple: Two arrays containing x and y of the compressed chunk
+        """
+        x = np.asarray(x)
+        y = np.asarray(y)
+        if not len(x):
+            return x, y
+        if self._x0 is None:
+            self._x0, self._y0 = x[0].item(), y[0].item()
             self._xn, self._yn = self._x0, self._y0
+            x, y = x[1:], y[1:]
+
+        if self.max_gap is not None:
+            if WITH_NUMBA:
+                x, y, *state = _compress_core(x,
+                                              y,
+                                              x.dtype.type(self._x0),
+                                              y.dtype.type(self._y0),
+                                              x.dtype.type(self._xn),
+                                              y.dtype.type(self._yn),
+                                              self.max_gap)
+                self._x0, self._y0, self._xn, self._yn = (
+                    v.item() if hasattr(v, "item") else v for v in state)
+                return x, y
+            out = list(self.compress(zip(x.tolist(), y.tolist())))
+            return (np.array([p[0] for p in out], dtype=x.dtype),
+                    np.array([p[1] for p in out], dtype=y.dtype))
+
+        # drop nodes with repeated x
+        keep = np.empty(len(x), dtype=bool)
+        keep[:1] = x[:1] != self._xn
+        np.not_equal(x[1:], x[:-1], out=keep[1:])
+        x, y = x[keep], y[keep]
+        if not len(x):
+            return x, y
+
+        # index of the first node of each new constant phase
+        change = np.empty(len(y), dtype=bool)
+        change[:1] = y[:1] != self._yn
+        np.not_equal(y[1:], y[:-1], out=change[1:])
+        begin = np.flatnonzero(change)
+        if not len(begin):
+            self._xn, self._yn = x[-1].item(), y[-1].item()
+            return x[:0], y[:0]
+
+        # first and last node of every phase terminated within this chunk
+        x0 = np.concatenate(([self._x0], x[begin[:-1]])).astype(x.dtype)
+        y0 = np.concatenate(([self._y0], y[begin[:-1]])).astype(y.dtype)
+        last = begin - 1
+        xn = x[last]
+        yn = y[last]
+        if last[0] < 0:
+            xn[0], yn[0] = self._xn, self._yn
+
+        self._x0, self._y0 = x[begin[-1]].item(), y[begin[-1]].item()
+        self._xn, self._yn = x[-1].item(), y[-1].item()
+
+        mask = np.stack((np.ones(len(x0), dtype=bool), xn != x0), axis=1)
+        mask = mask.ravel()
+        return (np.stack((x0, xn), axis=1).ravel()[mask],
+                np.stack((y0, yn), axis=1).ravel()[mask])
 
     def finalize(self):
         """Finalize compression
@@ -89,6 +197,54 @@ class Compressor(object):
             yield self._xn, self._yn
 
 
+if WITH_NUMBA:
+    @njit(cache=True, boundscheck=False)
+    def _compress_core(x, y, x0, y0, xn, yn, max_gap):
+        """Compiled state machine of :meth:`Compressor.compress`
+
+        Arguments:
+            x (numpy.ndarray): Timestamps (x-coordinates) of the chunk
+            y (numpy.ndarray): Values (y-coordinates) of the chunk
+            x0: x of the first node of the current constant phase
+            y0: y of the first node of the current constant phase
+            xn: x of the last node of the current constant phase
+            yn: y of the last node of the current constant phase
+            max_gap: Maximum allowed gap in x
+
+        Return:
+            tuple: Compressed x and y arrays followed by the updated values of
+            x0, y0, xn and yn.
+        """
+        xout = np.empty(2 * len(x), dtype=x.dtype)
+        yout = np.empty(2 * len(y), dtype=y.dtype)
+        k = 0
+        for i in range(len(x)):
+            xi = x[i]
+            yi = y[i]
+            if xi == xn:
+                continue
+
+            if yi == yn:
+                if xi - x0 > max_gap:
+                    xout[k] = x0
+                    yout[k] = y0
+                    k += 1
+                    x0, y0 = xn, yn
+                xn = xi
+                continue
+
+            xout[k] = x0
+            yout[k] = y0
+            k += 1
+            if xn != x0:
+                xout[k] = xn
+                yout[k] = yn
+                k += 1
+            x0, y0 = xi, yi
+            xn, yn = xi, yi
+        return xout[:k], yout[:k], x0, y0, xn, yn
+
+
 def compress_const(iterable, max_gap=None):
     """Compresses a time series by reducing number of nodes for const periods
 
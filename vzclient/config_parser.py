@@ -1,19 +1,72 @@
 import re
-import json
+import yaml
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
-multiline_comment = re.compile(r"/\*.*?\*/", re.MULTILINE|re.DOTALL)
-trailing_comment = re.compile(r"([\{\},\w]|\".*\")\s*//[^\n]*\n", re.MULTILINE)
-comment_line = re.compile("^\s*//.*\n", re.MULTILINE)
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+special_chars = re.compile(r'["/]')
 
 
 def remove_json_comments(string):
-    txt = trailing_comment.sub(r"\1\n",
-                               comment_line.sub("",
-                                                multiline_comment.sub("",
-                                                                      string)))
+    """Remove C-style comments and blank lines from a JSON string
+
+    Scans the string once, keeping track of whether the current position is
+    inside a string literal, so comment markers inside strings are preserved.
+    Text between markers is copied in slices located via :meth:`str.find`.
+
+    Arguments:
+        string (str): JSON text with comments
+
+    Return:
+        str: JSON text without comments and blank lines
+    """
+    out = []
+    n = len(string)
+    i = 0
+    while i < n:
+        m = special_chars.search(string, i)
+        if m is None:
+            out.append(string[i:])
+            break
+        j = m.start()
+        out.append(string[i:j])
+        if string[j] == '"':
+            # String literal: find closing quote not escaped by a backslash
+            k = j + 1
+            while True:
+                k = string.find('"', k)
+                if k < 0:
+                    k = n
+                    break
+                b = k
+                while string[b - 1] == "\\":
+                    b -= 1
+                k += 1
+                if (k - 1 - b) % 2 == 0:
+                    break
+            out.append(string[j:k])
+            i = k
+        elif string.startswith("//", j):
+            k = string.find("\n", j)
+            i = n if k < 0 else k
+        elif string.startswith("/*", j):
+            k = string.find("*/", j + 2)
+            i = n if k < 0 else k + 2
+        else:
+            out.append("/")
+            i = j + 1
+    txt = "".join(out)
     return "\n".join([line for line in txt.split("\n") if line.strip()])
 
+
 def read_vzlogger_config(path):
     """Parse vzlogger.conf
 
@@ -24,5 +77,22 @@ def read_vzlogger_config(path):
         dict: Dictionary with config options
     """
     with open(path) as ifile:
-        return json.loads(remove_json_comments(ifile.read()))
+        return json_loads(remove_json_comments(ifile.read()))
     return
+
+
+def read_yaml_config(path):
+    """Parse yaml configuration file
+
+    Uses the libyaml based loader, if PyYAML was built with it.
+
+    Arguments:
+        path (str or pathlib.Path): Path to config file
+
+    Return:
+        dict: Dictionary with config options. Empty, if the file contains no
+        document.
+    """
+    with open(path) as ifile:
+        cfg = yaml.load(ifile.read(), Loader=SafeLoader)
+    return cfg if cfg is not None else dict()
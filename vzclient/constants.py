@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta
+from functools import singledispatch
+from time import time_ns
 
 EPOCH = datetime(year=1970, month=1, day=1)
 
@@ -325,6 +327,9 @@ CHANNEL_TYPES = [
     }
 ]
 
+# Channel type definitions by name
+CHANNEL_TYPES_BY_NAME = {e["name"]: e for e in CHANNEL_TYPES}
+
 
 def time(t):
     """Convert timestamp to datetime object
@@ -338,16 +343,31 @@ def time(t):
     return EPOCH + timedelta(milliseconds=t)
 
 
+@singledispatch
 def timestamp(t):
     """Convert datetime object to timestamp
 
+    Integers are assumed to be timestamps already and returned unchanged.
+
     Arguments:
-        t (datetime.datetime): Datetime object
+        t (datetime.datetime or int): Datetime object
 
     Return:
         int: Timestamp [ms since EPOCH]
     """
-    return int(1000. * (t - EPOCH).total_seconds() + 0.5)
+    raise TypeError(f"Cannot convert {type(t).__name__} to timestamp")
+
+
+@timestamp.register(datetime)
+def _(t):
+    # Integer arithmetic avoids rounding errors of float seconds
+    d = t - EPOCH
+    return (d.days * 86400 + d.seconds) * 1000 + (d.microseconds + 500) // 1000
+
+
+@timestamp.register(int)
+def _(t):
+    return t
 
 
 def now():
@@ -356,4 +376,4 @@ def now():
     Return:
         int: Timestamp [ms since EPOCH]
     """
-    return timestamp(datetime.utcnow())
+    return time_ns() // 1000000
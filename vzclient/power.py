@@ -1,4 +1,7 @@
-from .time_derivative import TimeDerivative
+from .time_derivative import TimeDerivative, WITH_NUMPY
+
+if WITH_NUMPY:
+    import numpy as np
 
 
 class Power(object):
@@ -58,3 +61,22 @@ class Power(object):
             p *= 3.6
  
         return p
+
+    def batch(self, readings, timestamps):
+        """Calculate mean power for a batch of readings
+
+        Vectorized equivalent of :meth:`update`, which requires numpy. All
+        readings must be valid.
+
+        Arguments:
+            readings (numpy.ndarray): Meter readings
+            timestamps (numpy.ndarray): Timestamps [ms] of the readings
+
+        Return:
+            numpy.ndarray: Mean power between each reading and the reading
+            before. NaN, where no power can be calculated.
+        """
+        t = 0.001 * np.asarray(timestamps, dtype=np.float64)
+        p = self.dE_dt.batch(readings, t)
+        p *= 3.6
+        return p
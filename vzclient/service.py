@@ -12,6 +12,11 @@ class Service(object):
           while service.run:
               print("I am working")
           print("And now I am finished")
+
+    If used in an asynchronous with block, the signals are handled by the
+    running event loop and coroutines can wait for them via :meth:`wait_stop`:
+      async with Service() as service:
+          await service.wait_stop()
     """
     def __init__(self, signals=None, callback=None, **kwargs):
         self.cancel = False
@@ -19,15 +24,16 @@ class Service(object):
         self.frame = None
 
         self._saved_signals = dict()
-        self._sigterm = None
         if signals is None:
-            self._signals = [signal.SIGINT, signal.SIGTERM]
-        else:
-            self._signals = signals
+            signals = (signal.SIGINT, signal.SIGTERM)
+        # Duplicates would save our own handler as the previous one
+        self._signals = frozenset(signals)
 
         self._callback = callback
         self._args = kwargs
         self._callback_result = None
+        self._loop = None
+        self._stop_event = None
 
     @property
     def callback_result(self):
@@ -38,14 +44,14 @@ class Service(object):
         return self
 
     async def __aenter__(self):
-        self.__enter__()
+        self.enable_async()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.disable()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self.__exit__(exc_type, exc_val, exc_tb)
+        self.disable()
         if self._callback_result is not None:
             self._callback_result = await self._callback_result
 
@@ -54,10 +60,35 @@ class Service(object):
         for s in self._signals:
             self._saved_signals[s] = signal.signal(s, self.handle_signal)
 
+    def enable_async(self):
+        """Install signal handlers in the running event loop"""
+        self.disable()
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        for s in self._signals:
+            self._saved_signals[s] = signal.getsignal(s)
+            self._loop.add_signal_handler(s, self._on_signal, s)
+
     def disable(self):
         while self._saved_signals:
             s, f = self._saved_signals.popitem()
+            if self._loop is not None:
+                self._loop.remove_signal_handler(s)
             signal.signal(s, f)
+        self._loop = None
+
+    async def wait_stop(self):
+        """Wait until one of the signals has been received
+
+        Only available inside an asynchronous with block.
+        """
+        if self._stop_event is None:
+            raise RuntimeError("Service not entered asynchronously")
+        await self._stop_event.wait()
+
+    def _on_signal(self, signum):
+        self.handle_signal(signum, None)
+        self._stop_event.set()
 
     def handle_signal(self, signum, frame):
         self.signum = signum
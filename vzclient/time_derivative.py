@@ -1,4 +1,10 @@
-from datetime import datetime
+from time import time
+
+try:
+    import numpy as np
+    WITH_NUMPY = True
+except ImportError:
+    WITH_NUMPY = False
 
 
 class TimeDerivative(object):
@@ -56,14 +62,46 @@ class TimeDerivative(object):
                 dy_dt = dy / dt
         return dy_dt
             
+    def batch(self, values, timestamps):
+        """Calculate the derivative for a batch of observations
+
+        Vectorized equivalent of calling this instance for every observation,
+        which requires numpy. All values must be valid observations.
+
+        Arguments:
+            values (numpy.ndarray): Observations (measured values)
+            timestamps (numpy.ndarray): Timestamps at which the observations
+                were made. Must have the same length as `values`.
+
+        Return:
+            numpy.ndarray: Change between each observation and the one
+            before. NaN, where the time difference is not positive or no
+            previous observation exists.
+        """
+        y = np.asarray(values, dtype=np.float64)
+        t = np.asarray(timestamps, dtype=np.float64)
+        if len(y) != len(t):
+            raise ValueError("Timestamps and values differ in length")
+        if not len(y):
+            return y
+
+        t0, y0 = self._last
+        if t0 is None or y0 is None:
+            t0, y0 = np.nan, np.nan
+        dt = np.diff(t, prepend=t0)
+        dy = np.diff(y, prepend=y0)
+        valid = dt > 0.
+        dy_dt = np.full(len(y), np.nan)
+        np.divide(dy, dt, out=dy_dt, where=valid)
+        self._last = (t[-1].item(), y[-1].item())
+        return dy_dt
+
     @staticmethod
     def now():
         """Get the current time as timestamp
 
-        Equivalent to ``datetime.datetime.utcnow().timestamp()``
-
         Return:
-            float: Current UTC time as timestamp
+            float: Current time [s since the epoch]
         """
-        return datetime.utcnow().timestamp()
+        return time()
 
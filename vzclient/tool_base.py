@@ -1,7 +1,19 @@
 import logging, asyncio, argparse
 from inspect import iscoroutinefunction
-from copy import deepcopy
-import yaml
+from .config_parser import read_yaml_config
+
+# Log levels of the tool and of third party libraries by verbosity
+LOG_LEVELS = {
+    0: logging.WARNING,
+    1: logging.INFO,
+    2: logging.DEBUG
+}
+
+THIRD_PARTY_LOG_LEVELS = {
+    0: logging.WARNING,
+    1: logging.WARNING,
+    2: logging.INFO
+}
 
 
 class ToolBase:
@@ -73,33 +85,20 @@ class ToolBase:
         return config
 
     def configure_logging(self, verbose_mode=0, log_level=None, log_file=None):
-        log_levels = {
-            0: logging.WARNING,
-            1: logging.INFO,
-            2: logging.DEBUG
-        }
-
-        third_party_log_levels = {
-            0: logging.WARNING,
-            1: logging.WARNING,
-            2: logging.INFO
-        }
-
         if log_level is None:
-            log_level = log_levels.get(verbose_mode, logging.DEBUG)
+            log_level = LOG_LEVELS.get(verbose_mode, logging.DEBUG)
 
-        third_party_log_level = third_party_log_levels.get(verbose_mode,
+        third_party_log_level = THIRD_PARTY_LOG_LEVELS.get(verbose_mode,
                                                            logging.DEBUG)
         if verbose_mode > 3:
             self.debug = True
 
         if log_file:
-            h = logging.FileHandler(log_file, 'a')
-            for handler in self.log.handlers:
+            for handler in list(self.log.handlers):
                 self.log.removeHandler(handler)
+            self.log.addHandler(logging.FileHandler(log_file, 'a'))
         elif not self.log.handlers:
-            h = logging.StreamHandler()
-        self.log.addHandler(h)
+            self.log.addHandler(logging.StreamHandler())
 
         fmt = logging.Formatter(fmt=logging.BASIC_FORMAT)
         for h in self.log.handlers:
@@ -122,15 +121,8 @@ class ToolBase:
             tuple: Three dictionaries containing default options, default source
             options and
         """
-        if default_config is None:
-            default_cfg = dict()
-        else:
-            default_cfg = deepcopy(default_config)
-
-        with open(path) as cfg_file:
-            yaml_cfg = yaml.load(cfg_file, Loader=yaml.SafeLoader)
-
-        self.config = self.unify_sectionwise(yaml_cfg, default_cfg)
+        yaml_cfg = read_yaml_config(path)
+        self.config = self.unify_sectionwise(yaml_cfg, default_config)
 
     def main_wrapper(self, main, *args, **kwargs):
         exit_code = 1
@@ -139,13 +131,14 @@ class ToolBase:
             if exit_code is None:
                 exit_code = 0
         except Exception as ex:
-            self.log.exception(f"{ex}")
+            self.log.exception("%s", ex)
         except SystemExit as ex:
             exit_code = ex.code
-
-        if self.loop is not None and not self.loop.is_closed():
-            self.loop.close()
-            self.loop = None
+        finally:
+            # also on exceptions, which are not handled here
+            if self.loop is not None and not self.loop.is_closed():
+                self.loop.close()
+                self.loop = None
 
         if exit_code:
             self.log.error("Program terminated abnormally")
@@ -197,20 +190,21 @@ class ToolBase:
         Return:
             dict: Merged dictionary with options
         """
-        sections = ToolBase.get_sections(options)
-        sections.update(ToolBase.get_sections(default))
-
+        # Merge iteratively, copying only the dictionaries of each section
         retval = dict()
-        for section in sections:
-            opts = options.get(section, dict())
-            if default is not None:
-                default_opts = default.get(section, dict())
-            else:
-                default_opts = dict()
-            retval[section] = ToolBase.unify_sectionwise(opts, default_opts)
-
-        for d in (default, options):
-            if d is not None:
-                retval.update({k: v for k, v in d.items() if k not in sections})
+        stack = [(retval, options, default)]
+        while stack:
+            merged, opts, defaults = stack.pop()
+            opts = opts if isinstance(opts, dict) else dict()
+            defaults = defaults if isinstance(defaults, dict) else dict()
+            sections = ToolBase.get_sections(opts)
+            sections.update(ToolBase.get_sections(defaults))
+            merged.update(defaults)
+            merged.update(opts)
+            for section in sections:
+                merged[section] = dict()
+                stack.append((merged[section],
+                              opts.get(section),
+                              defaults.get(section)))
 
         return retval